@@ -2,28 +2,34 @@
 """Startup script for the Restaurant Recommendation MCP Server."""
 
 import sys
-import os
-import argparse
+import atexit
 import logging
+import logging.handlers
+import queue
 from pathlib import Path
 
-# Add src directory to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
-
-from src.server import main
 from src.config import validate_configuration
 
 def setup_logging(debug: bool = False):
     """Setup logging configuration."""
     level = logging.DEBUG if debug else logging.INFO
-    logging.basicConfig(
-        level=level,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.StreamHandler(sys.stdout),
-            logging.FileHandler('picky_mcp.log')
-        ]
-    )
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    
+    stream_handler = logging.StreamHandler(sys.stdout)
+    file_handler = logging.FileHandler('picky_mcp.log')
+    for handler in (stream_handler, file_handler):
+        handler.setFormatter(formatter)
+    
+    # Loggers only enqueue records; a background thread does the actual I/O
+    # so disk writes never block the event loop.
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, stream_handler, file_handler)
+    listener.start()
+    atexit.register(listener.stop)
+    
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
 
 def check_environment():
     """Check if environment is properly configured."""
@@ -60,18 +66,26 @@ def check_environment():
 
 def main_cli():
     """Main CLI entry point."""
-    parser = argparse.ArgumentParser(description="Restaurant Recommendation MCP Server")
-    parser.add_argument("--debug", action="store_true", help="Enable debug logging")
-    parser.add_argument("--check-env", action="store_true", help="Check environment configuration")
-    parser.add_argument("--no-sync", action="store_true", help="Disable automatic synchronization")
-    
-    args = parser.parse_args()
+    argv = sys.argv[1:]
+    if argv:
+        # Only pay for argparse when flags were actually passed
+        import argparse
+        
+        parser = argparse.ArgumentParser(description="Restaurant Recommendation MCP Server")
+        parser.add_argument("--debug", action="store_true", help="Enable debug logging")
+        parser.add_argument("--check-env", action="store_true", help="Check environment configuration")
+        parser.add_argument("--no-sync", action="store_true", help="Disable automatic synchronization")
+        
+        args = parser.parse_args(argv)
+        debug, check_env = args.debug, args.check_env
+    else:
+        debug, check_env = False, False
     
     # Setup logging
-    setup_logging(args.debug)
+    setup_logging(debug)
     
     # Check environment if requested
-    if args.check_env:
+    if check_env:
         if check_environment():
             print("✅ Environment check passed")
             return 0
@@ -86,6 +100,10 @@ def main_cli():
     
     print("🚀 Starting Restaurant Recommendation MCP Server...")
     
+    # Importing the server loads the MCP, Notion and Google Maps libraries, so
+    # defer it until we are actually starting up (keeps --check-env and --help fast)
+    from src.server import main
+    
     try:
         main()
         return 0
@@ -0,0 +1,100 @@
+"""In-process caching helpers shared by the API clients and managers."""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Bounded LRU cache whose entries expire ``ttl`` seconds after insertion."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 3600):
+        """Initialize the cache."""
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        # Bumped by clear() so fetches started before it don't store their results
+        self._generation = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for ``key`` or ``default`` if missing/expired."""
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return default
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store ``value`` under ``key``, evicting the least recently used entry."""
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove ``key`` and return its value (expired or not)."""
+        entry = self._data.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def clear(self) -> None:
+        """Drop every cached entry; fetches already in flight won't be cached."""
+        self._data.clear()
+        self._inflight.clear()
+        self._generation += 1
+
+    async def get_or_set(
+        self,
+        key: Hashable,
+        factory: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Return the cached value or await ``factory()`` and cache its result.
+
+        Concurrent callers asking for the same missing key share a single
+        ``factory()`` call. ``None`` results are returned but not cached, so
+        failed lookups are retried on the next call. A result whose fetch
+        started before the last ``clear()`` is returned but not cached either.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        task = self._inflight.get(key)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(self._fetch(key, factory, self._generation))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget_inflight(key, done))
+
+        # Shielded so a cancelled caller doesn't cancel the fetch for the others
+        return await asyncio.shield(task)
+
+    async def _fetch(
+        self,
+        key: Hashable,
+        factory: Callable[[], Awaitable[Any]],
+        generation: int
+    ) -> Any:
+        """Await ``factory()`` and cache its result unless ``clear()`` ran meanwhile."""
+        value = await factory()
+        if value is not None and generation == self._generation:
+            self.set(key, value)
+        return value
+
+    def _forget_inflight(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
@@ -1,15 +1,13 @@
 """Configuration management for the Picky MCP Server."""
 
 import os
+import pathlib
+from functools import lru_cache
 from typing import Optional
 from pydantic import Field
 from pydantic_settings import BaseSettings
-from dotenv import load_dotenv
 
-# Load environment variables from .env file
-import pathlib
 project_root = pathlib.Path(__file__).parent.parent
-load_dotenv(project_root / ".env")
 
 
 class Settings(BaseSettings):
@@ -31,12 +29,18 @@ class Settings(BaseSettings):
     max_recommendations: int = Field(default=10, env="MAX_RECOMMENDATIONS")
     default_search_radius_km: float = Field(default=25.0, env="DEFAULT_SEARCH_RADIUS_KM")
     cache_ttl_seconds: int = Field(default=3600, env="CACHE_TTL_SECONDS")
+    enrich_concurrency: int = Field(default=10, env="ENRICH_CONCURRENCY")
     
     model_config = {"env_file": str(project_root / ".env"), "case_sensitive": False, "extra": "ignore"}
 
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    """Get application settings."""
+    """Get application settings.
+
+    The settings are parsed once and cached; call ``get_settings.cache_clear()``
+    to force a reload (e.g. in tests that patch the environment).
+    """
     return Settings()
 
 
@@ -61,5 +65,14 @@ def validate_configuration() -> dict:
         }
 
 
-# Global settings instance
-settings = get_settings()
\ No newline at end of file
+def __getattr__(name: str):
+    """Build the module-level ``settings`` lazily on first access (PEP 562).
+
+    Importing this module stays cheap; the environment is only parsed once
+    something actually reads ``settings``.
+    """
+    if name == "settings":
+        value = get_settings()
+        globals()["settings"] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -1,25 +1,94 @@
 """Google Maps API client for restaurant data enrichment."""
 
+import asyncio
+import copy
+import functools
 import logging
-from typing import Dict, List, Optional, Any, Tuple
-import googlemaps
-from googlemaps.exceptions import ApiError
+from typing import Callable, Dict, List, Optional, Any, Tuple, Union
 
 from .models import (
     Restaurant, Location, GooglePlacesData, CuisineType, PriceRange
 )
-from .config import settings
+from .config import get_settings
+from .cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# Google Places type -> cuisine, built once instead of on every parsed place.
+_CUISINE_MAPPING = {
+    "italian_restaurant": CuisineType.ITALIAN,
+    "chinese_restaurant": CuisineType.CHINESE,
+    "japanese_restaurant": CuisineType.JAPANESE,
+    "mexican_restaurant": CuisineType.MEXICAN,
+    "indian_restaurant": CuisineType.INDIAN,
+    "french_restaurant": CuisineType.FRENCH,
+    "thai_restaurant": CuisineType.THAI,
+    "mediterranean_restaurant": CuisineType.MEDITERRANEAN,
+    "american_restaurant": CuisineType.AMERICAN,
+    "seafood_restaurant": CuisineType.SEAFOOD,
+    "steak_house": CuisineType.STEAKHOUSE,
+    "pizza_restaurant": CuisineType.PIZZA,
+    "sushi_restaurant": CuisineType.SUSHI,
+    "barbecue_restaurant": CuisineType.BARBECUE,
+    "vegetarian_restaurant": CuisineType.VEGETARIAN,
+    "meal_takeaway": CuisineType.FAST_FOOD,
+    "fast_food_restaurant": CuisineType.FAST_FOOD,
+    "cafe": CuisineType.CAFE,
+    "bakery": CuisineType.BAKERY,
+}
+_CUISINE_KEYS = frozenset(_CUISINE_MAPPING)
+
+_BASE_DETAIL_FIELDS = (
+    "name", "rating", "price_level", "types",
+    "formatted_address", "formatted_phone_number",
+    "website", "geometry",
+)
+
+# Nearby searches change slowly; reuse them for 15 minutes. Locations are
+# rounded to ~100 m and radii bucketed to 500 m so nearby requests share entries.
+_SEARCH_TTL_SECONDS = 900
+_SEARCH_RADIUS_BUCKET_METERS = 500
+
+_PRICE_MAPPING = {
+    0: PriceRange.BUDGET,
+    1: PriceRange.BUDGET,
+    2: PriceRange.MODERATE,
+    3: PriceRange.EXPENSIVE,
+    4: PriceRange.VERY_EXPENSIVE,
+}
+
 
 class GoogleMapsClient:
     """Manages Google Maps API interactions for restaurant data enrichment."""
     
     def __init__(self, api_key: str = None):
         """Initialize Google Maps client."""
+        # googlemaps pulls in requests/urllib3, so only import it once a client
+        # is actually needed (keeps `run_server.py --check-env` fast).
+        import googlemaps
+        from googlemaps.exceptions import ApiError
+        
+        settings = get_settings()
         self.api_key = api_key or settings.google_places_api_key
         self.client = googlemaps.Client(key=self.api_key)
+        self._api_error = ApiError
+        
+        # Place details and geocodes rarely change; cache them for the TTL
+        self._details_cache = TTLCache(maxsize=1024, ttl=settings.cache_ttl_seconds)
+        self._geocode_cache = TTLCache(maxsize=1024, ttl=settings.cache_ttl_seconds)
+        # Name -> matching place, so re-enriching a restaurant skips the text search
+        self._place_match_cache = TTLCache(maxsize=1024, ttl=settings.cache_ttl_seconds)
+        self._search_cache = TTLCache(maxsize=4096, ttl=_SEARCH_TTL_SECONDS)
+        self.enrich_concurrency = settings.enrich_concurrency
+    
+    async def _run(self, method: Callable[..., Any], **kwargs: Any) -> Any:
+        """Run a blocking googlemaps call in the default executor.
+        
+        googlemaps is a synchronous client; running it off the event loop keeps
+        the MCP server responsive and lets independent requests overlap.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(method, **kwargs))
     
     def test_connection(self) -> Dict[str, Any]:
         """Test Google Maps API connection."""
@@ -31,7 +100,7 @@ class GoogleMapsClient:
                 "message": "Google Maps API connection successful",
                 "test_result": len(result) > 0
             }
-        except ApiError as e:
+        except self._api_error as e:
             logger.error(f"Google Maps API connection test failed: {e}")
             return {"success": False, "error": str(e)}
     
@@ -43,9 +112,31 @@ class GoogleMapsClient:
         restaurant_type: str = "restaurant"
     ) -> List[Dict[str, Any]]:
         """Search for restaurants near a location."""
+        key = (
+            query,
+            restaurant_type,
+            round(location[0], 3),
+            round(location[1], 3),
+            radius // _SEARCH_RADIUS_BUCKET_METERS,
+        )
+        restaurants = await self._search_cache.get_or_set(
+            key, lambda: self._search_restaurants(query, location, radius, restaurant_type)
+        )
+        # Failed searches come back as None (and aren't cached)
+        return list(restaurants) if restaurants is not None else []
+    
+    async def _search_restaurants(
+        self,
+        query: str,
+        location: Tuple[float, float],
+        radius: int,
+        restaurant_type: str
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Run a nearby search and parse the results; ``None`` on API errors."""
         try:
             # Use Places API to search for restaurants
-            places_result = self.client.places_nearby(
+            places_result = await self._run(
+                self.client.places_nearby,
                 location=location,
                 radius=radius,
                 type=restaurant_type,
@@ -63,9 +154,9 @@ class GoogleMapsClient:
                     continue
             
             return restaurants
-        except ApiError as e:
+        except self._api_error as e:
             logger.error(f"Failed to search restaurants: {e}")
-            return []
+            return None
     
     async def find_restaurant_by_name(
         self,
@@ -74,9 +165,24 @@ class GoogleMapsClient:
         radius: int = 10000
     ) -> Optional[Dict[str, Any]]:
         """Find a specific restaurant by name and location."""
+        key = (name.lower(), round(location[0], 3), round(location[1], 3), radius)
+        place = await self._place_match_cache.get_or_set(
+            key, lambda: self._find_restaurant_by_name(name, location, radius)
+        )
+        # Hand out a copy so callers can't edit the cached match
+        return copy.deepcopy(place)
+    
+    async def _find_restaurant_by_name(
+        self,
+        name: str,
+        location: Tuple[float, float],
+        radius: int
+    ) -> Optional[Dict[str, Any]]:
+        """Text-search for the place matching ``name`` near ``location``."""
         try:
             # Use text search for more precise results
-            places_result = self.client.places(
+            places_result = await self._run(
+                self.client.places,
                 query=f"{name} restaurant",
                 location=location,
                 radius=radius,
@@ -88,21 +194,49 @@ class GoogleMapsClient:
                     return await self._parse_place_to_restaurant_data(place)
             
             return None
-        except ApiError as e:
+        except self._api_error as e:
             logger.error(f"Failed to find restaurant by name: {e}")
             return None
     
-    async def get_place_details(self, place_id: str) -> Optional[GooglePlacesData]:
-        """Get detailed information about a place."""
+    async def get_place_details(
+        self,
+        place_id: str,
+        *,
+        include_photos: bool = False,
+        include_reviews: bool = False,
+        include_hours: bool = False
+    ) -> Optional[GooglePlacesData]:
+        """Get detailed information about a place.
+        
+        Photos, reviews and opening hours are the heaviest (and most expensive)
+        Place Details fields, so they are only requested when asked for.
+        """
+        fields = list(_BASE_DETAIL_FIELDS)
+        if include_hours:
+            fields.append("opening_hours")
+        if include_photos:
+            fields.append("photos")
+        if include_reviews:
+            fields.append("reviews")
+        
+        details = await self._details_cache.get_or_set(
+            (place_id, include_photos, include_reviews, include_hours),
+            lambda: self._fetch_place_details(place_id, fields)
+        )
+        # Callers attach the result to restaurants they go on to edit
+        return details.model_copy(deep=True) if details else None
+    
+    async def _fetch_place_details(
+        self,
+        place_id: str,
+        fields: List[str]
+    ) -> Optional[GooglePlacesData]:
+        """Fetch place details from the Places API."""
         try:
-            details = self.client.place(
+            details = await self._run(
+                self.client.place,
                 place_id=place_id,
-                fields=[
-                    "name", "rating", "price_level", "types",
-                    "formatted_address", "formatted_phone_number",
-                    "website", "opening_hours", "photos", "reviews",
-                    "geometry"
-                ]
+                fields=fields
             )
             
             result = details.get("result", {})
@@ -120,9 +254,10 @@ class GoogleMapsClient:
                 website=result.get("website"),
                 opening_hours=result.get("opening_hours"),
                 photos=[photo.get("photo_reference", "") for photo in result.get("photos", [])],
-                reviews=result.get("reviews", [])
+                reviews=result.get("reviews", []),
+                geometry=result.get("geometry")
             )
-        except ApiError as e:
+        except self._api_error as e:
             logger.error(f"Failed to get place details: {e}")
             return None
     
@@ -138,38 +273,44 @@ class GoogleMapsClient:
             if not place_details:
                 return []
             
-            # Get the location of the original place
-            details = self.client.place(place_id=place_id, fields=["geometry"])
-            location_data = details.get("result", {}).get("geometry", {}).get("location", {})
+            # Reuse the geometry already fetched with the place details
+            location_data = (place_details.geometry or {}).get("location", {})
             
             if not location_data:
                 return []
             
             location = (location_data["lat"], location_data["lng"])
             
-            # Search for similar restaurants based on cuisine types
-            similar_restaurants = []
+            # Search for similar restaurants based on cuisine types (concurrently)
             cuisine_types = self._extract_cuisine_from_types(place_details.types)
             
-            for cuisine in cuisine_types:
-                restaurants = await self.search_restaurants(
+            results = await asyncio.gather(*[
+                self.search_restaurants(
                     query=f"{cuisine} restaurant",
                     location=location,
                     radius=radius
                 )
-                similar_restaurants.extend(restaurants)
+                for cuisine in cuisine_types
+            ], return_exceptions=True)
             
-            # Remove duplicates and the original restaurant
+            # Dedup (and drop the original restaurant) while collecting, stopping at 10
             unique_restaurants = []
             seen_place_ids = {place_id}
             
-            for restaurant in similar_restaurants:
-                if restaurant.get("place_id") not in seen_place_ids:
-                    unique_restaurants.append(restaurant)
-                    seen_place_ids.add(restaurant.get("place_id"))
+            for restaurants in results:
+                if isinstance(restaurants, Exception):
+                    logger.warning(f"Similar restaurant search failed: {restaurants}")
+                    continue
+                for restaurant in restaurants:
+                    pid = restaurant.get("place_id")
+                    if pid and pid not in seen_place_ids:
+                        seen_place_ids.add(pid)
+                        unique_restaurants.append(restaurant)
+                        if len(unique_restaurants) == 10:
+                            return unique_restaurants
             
-            return unique_restaurants[:10]  # Limit to top 10
-        except ApiError as e:
+            return unique_restaurants
+        except self._api_error as e:
             logger.error(f"Failed to find similar restaurants: {e}")
             return []
     
@@ -196,31 +337,57 @@ class GoogleMapsClient:
                     )
                     
                     if restaurant_data:
+                        coordinates = restaurant_data.get("location", {})
+                        geometry = None
+                        if coordinates.get("latitude") is not None and coordinates.get("longitude") is not None:
+                            geometry = {
+                                "location": {
+                                    "lat": coordinates["latitude"],
+                                    "lng": coordinates["longitude"]
+                                }
+                            }
+                        
                         restaurant.google_places_data = GooglePlacesData(
                             place_id=restaurant_data["place_id"],
                             name=restaurant_data["name"],
                             rating=restaurant_data.get("rating"),
                             price_level=restaurant_data.get("price_level"),
                             types=restaurant_data.get("types", []),
-                            formatted_address=restaurant_data.get("formatted_address")
+                            formatted_address=restaurant_data.get("formatted_address"),
+                            geometry=geometry
                         )
             
-            # Update location coordinates if we have them
-            if restaurant.google_places_data:
-                details = self.client.place(
-                    place_id=restaurant.google_places_data.place_id,
-                    fields=["geometry"]
-                )
-                geometry = details.get("result", {}).get("geometry", {})
-                if geometry.get("location"):
-                    restaurant.location.latitude = geometry["location"]["lat"]
-                    restaurant.location.longitude = geometry["location"]["lng"]
+            # Update location coordinates from the geometry we already fetched
+            if restaurant.google_places_data and restaurant.google_places_data.geometry:
+                location_data = restaurant.google_places_data.geometry.get("location")
+                if location_data:
+                    restaurant.location.latitude = location_data["lat"]
+                    restaurant.location.longitude = location_data["lng"]
             
             return restaurant
         except Exception as e:
             logger.error(f"Failed to enrich restaurant data: {e}")
             return restaurant
     
+    async def enrich_restaurants(
+        self,
+        restaurants: List[Restaurant],
+        concurrency: Optional[int] = None
+    ) -> List[Union[Restaurant, BaseException]]:
+        """Enrich copies of many restaurants concurrently, at most ``concurrency`` at a time.
+        
+        The inputs are usually the cached Notion listing and are left untouched.
+        Each result is the enriched copy, or the exception raised while
+        enriching that restaurant.
+        """
+        semaphore = asyncio.Semaphore(concurrency or self.enrich_concurrency)
+        
+        async def enrich_one(restaurant: Restaurant) -> Restaurant:
+            async with semaphore:
+                return await self.enrich_restaurant_data(restaurant.model_copy(deep=True))
+        
+        return await asyncio.gather(*[enrich_one(r) for r in restaurants], return_exceptions=True)
+    
     async def get_restaurant_recommendations_near_location(
         self,
         location: Tuple[float, float],
@@ -233,7 +400,8 @@ class GoogleMapsClient:
         try:
             query = f"{cuisine_type} restaurant" if cuisine_type else "restaurant"
             
-            places_result = self.client.places_nearby(
+            places_result = await self._run(
+                self.client.places_nearby,
                 location=location,
                 radius=radius,
                 type="restaurant",
@@ -259,7 +427,7 @@ class GoogleMapsClient:
                     continue
             
             return restaurants
-        except ApiError as e:
+        except self._api_error as e:
             logger.error(f"Failed to get recommendations: {e}")
             return []
     
@@ -311,49 +479,17 @@ class GoogleMapsClient:
     
     def _extract_cuisine_from_types(self, types: List[str]) -> List[CuisineType]:
         """Extract cuisine types from Google Places types."""
-        cuisine_mapping = {
-            "italian_restaurant": CuisineType.ITALIAN,
-            "chinese_restaurant": CuisineType.CHINESE,
-            "japanese_restaurant": CuisineType.JAPANESE,
-            "mexican_restaurant": CuisineType.MEXICAN,
-            "indian_restaurant": CuisineType.INDIAN,
-            "french_restaurant": CuisineType.FRENCH,
-            "thai_restaurant": CuisineType.THAI,
-            "mediterranean_restaurant": CuisineType.MEDITERRANEAN,
-            "american_restaurant": CuisineType.AMERICAN,
-            "seafood_restaurant": CuisineType.SEAFOOD,
-            "steak_house": CuisineType.STEAKHOUSE,
-            "pizza_restaurant": CuisineType.PIZZA,
-            "sushi_restaurant": CuisineType.SUSHI,
-            "barbecue_restaurant": CuisineType.BARBECUE,
-            "vegetarian_restaurant": CuisineType.VEGETARIAN,
-            "meal_takeaway": CuisineType.FAST_FOOD,
-            "fast_food_restaurant": CuisineType.FAST_FOOD,
-            "cafe": CuisineType.CAFE,
-            "bakery": CuisineType.BAKERY,
-        }
-        
-        cuisines = []
-        for place_type in types:
-            if place_type in cuisine_mapping:
-                cuisines.append(cuisine_mapping[place_type])
+        if _CUISINE_KEYS.isdisjoint(types):
+            return [CuisineType.OTHER]
         
-        return cuisines if cuisines else [CuisineType.OTHER]
+        return [_CUISINE_MAPPING[t] for t in types if t in _CUISINE_KEYS]
     
     def _map_price_level_to_range(self, price_level: Optional[int]) -> Optional[PriceRange]:
         """Map Google Places price level to our price range enum."""
         if price_level is None:
             return None
         
-        mapping = {
-            0: PriceRange.BUDGET,
-            1: PriceRange.BUDGET,
-            2: PriceRange.MODERATE,
-            3: PriceRange.EXPENSIVE,
-            4: PriceRange.VERY_EXPENSIVE,
-        }
-        
-        return mapping.get(price_level)
+        return _PRICE_MAPPING.get(price_level)
     
     async def _geocode_address(self, location: Location) -> Optional[Tuple[float, float]]:
         """Geocode an address to get coordinates."""
@@ -372,12 +508,33 @@ class GoogleMapsClient:
             if not address:
                 return None
             
-            geocode_result = self.client.geocode(address)
-            if geocode_result:
-                location_data = geocode_result[0]["geometry"]["location"]
-                return (location_data["lat"], location_data["lng"])
-            
-            return None
+            return await self._geocode_cache.get_or_set(
+                address.strip().lower(), lambda: self._fetch_geocode(address)
+            )
         except Exception as e:
             logger.error(f"Failed to geocode address: {e}")
-            return None
\ No newline at end of file
+            return None
+    
+    async def _fetch_geocode(self, address: str) -> Optional[Tuple[float, float]]:
+        """Geocode an address string with the Geocoding API."""
+        geocode_result = await self._run(self.client.geocode, address=address)
+        if geocode_result:
+            location_data = geocode_result[0]["geometry"]["location"]
+            return (location_data["lat"], location_data["lng"])
+        
+        return None
+
+
+_client_singleton: Optional[GoogleMapsClient] = None
+
+
+def get_maps_client() -> GoogleMapsClient:
+    """Get the shared Google Maps client, creating it on first use.
+
+    Reusing one client keeps its HTTP session (and warm TLS connections) and
+    response caches alive across tool calls.
+    """
+    global _client_singleton
+    if _client_singleton is None:
+        _client_singleton = GoogleMapsClient()
+    return _client_singleton
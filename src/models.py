@@ -1,7 +1,9 @@
 """Data models for the Picky MCP Server."""
 
-from typing import Dict, List, Optional, Union, Any
+from typing import ClassVar, Dict, List, Mapping, Optional, Tuple, Union, Any
 from datetime import datetime
+from functools import cached_property
+from types import MappingProxyType
 from pydantic import BaseModel, Field
 from enum import Enum
 
@@ -71,7 +73,56 @@ class OccasionType(str, Enum):
     TAKEOUT = "takeout"
 
 
-class Location(BaseModel):
+# Value -> member lookups; a dict .get() avoids Enum.__call__ and its
+# ValueError path when parsing untrusted strings
+CUISINE_BY_VALUE = {c.value: c for c in CuisineType}
+PRICE_RANGE_BY_VALUE = {p.value: p for p in PriceRange}
+VIBE_BY_VALUE = {v.value: v for v in VibeType}
+OCCASION_BY_VALUE = {o.value: o for o in OccasionType}
+
+# Case-insensitive variants for tool arguments typed by users; keys are lower-cased
+CUISINE_BY_NAME = {c.value.lower(): c for c in CuisineType}
+PRICE_RANGE_BY_NAME = {p.value.lower(): p for p in PriceRange}
+VIBE_BY_NAME = {v.value.lower(): v for v in VibeType}
+OCCASION_BY_NAME = {o.value.lower(): o for o in OccasionType}
+
+
+class TrustedModel(BaseModel):
+    """Base for models that are also built from already-normalized data.
+
+    Subclasses list their ``cached_property`` names in ``cached_properties``;
+    the cached values are dropped whenever a field is assigned and on
+    ``model_copy``, so they never outlive the fields they were derived from.
+    In-place edits (appending to a list, editing a nested model) are not seen.
+    """
+
+    cached_properties: ClassVar[Tuple[str, ...]] = ()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        self._clear_cached_properties()
+
+    def model_copy(self, *, update: Optional[Mapping[str, Any]] = None, deep: bool = False):
+        """Copy the model; cached properties are recomputed on the copy."""
+        copied = super().model_copy(update=update, deep=deep)
+        copied._clear_cached_properties()
+        return copied
+
+    def _clear_cached_properties(self) -> None:
+        for name in self.cached_properties:
+            self.__dict__.pop(name, None)
+
+    @classmethod
+    def from_trusted(cls, **data: Any):
+        """Build an instance without running validation.
+
+        Only use this for data that already has the field types (e.g. parsed
+        Notion pages); user-supplied input should go through the constructor.
+        """
+        return cls.model_construct(**data)
+
+
+class Location(TrustedModel):
     """Geographic location model."""
     address: Optional[str] = None
     city: str
@@ -82,8 +133,15 @@ class Location(BaseModel):
     neighborhood: Optional[str] = None
     postal_code: Optional[str] = None
 
+    cached_properties = ("display",)
+
+    @cached_property
+    def display(self) -> str:
+        """"City, State" (or just the city), as shown in tool responses."""
+        return f"{self.city}, {self.state}" if self.state else self.city
+
 
-class GooglePlacesData(BaseModel):
+class GooglePlacesData(TrustedModel):
     """Google Places API data model."""
     place_id: str
     name: str
@@ -96,9 +154,10 @@ class GooglePlacesData(BaseModel):
     opening_hours: Optional[Dict[str, Any]] = None
     photos: List[str] = []
     reviews: List[Dict[str, Any]] = []
+    geometry: Optional[Dict[str, Any]] = None
 
 
-class Restaurant(BaseModel):
+class Restaurant(TrustedModel):
     """Restaurant model."""
     id: Optional[str] = None
     name: str
@@ -116,6 +175,37 @@ class Restaurant(BaseModel):
     created_at: datetime = Field(default_factory=datetime.now)
     updated_at: datetime = Field(default_factory=datetime.now)
 
+    cached_properties = ("folded_name", "cuisine_values", "vibe_values", "summary")
+
+    @cached_property
+    def folded_name(self) -> str:
+        """Case-folded name for case-insensitive matching."""
+        return self.name.casefold()
+
+    @cached_property
+    def cuisine_values(self) -> Tuple[str, ...]:
+        """Cuisine names as shown in tool responses."""
+        return tuple(c.value for c in self.cuisine_types)
+
+    @cached_property
+    def vibe_values(self) -> Tuple[str, ...]:
+        """Vibe names as shown in tool responses."""
+        return tuple(v.value for v in self.vibes)
+
+    @cached_property
+    def summary(self) -> Dict[str, Any]:
+        """Every field a tool response can list for this restaurant, formatted once."""
+        return {
+            "name": self.name,
+            "rating": self.personal_rating,
+            "date_visited": self.date_visited.isoformat() if self.date_visited else None,
+            "location": self.location.display,
+            "cuisine_types": self.cuisine_values,
+            "price_range": self.price_range.value if self.price_range else None,
+            "notes": self.notes,
+            "revisit": self.revisit,
+        }
+
 
 class UserPreferences(BaseModel):
     """User dining preferences model."""
@@ -168,36 +258,29 @@ class Recommendation(BaseModel):
     generated_at: datetime = Field(default_factory=datetime.now)
 
 
+# Default Notion property layout; read-only so it can be shared by every schema
+DEFAULT_NOTION_PROPERTIES: Mapping[str, Any] = MappingProxyType({
+    "Name": {"type": "title"},
+    "Rating": {"type": "number"},
+    "Cuisine": {"type": "multi_select"},
+    "Location": {"type": "rich_text"},
+    "Date Visited": {"type": "date"},
+    "Notes": {"type": "rich_text"},
+    "Google Place ID": {"type": "rich_text"},
+    "Price Range": {"type": "select"},
+    "Vibes": {"type": "multi_select"},
+    "Revisit": {"type": "checkbox"},
+    "Wishlist": {"type": "checkbox"},
+    "City": {"type": "rich_text"},
+    "State": {"type": "rich_text"},
+})
+
+
 class NotionDatabaseSchema(BaseModel):
     """Notion database schema configuration."""
     database_id: str
-    properties: Dict[str, Any] = {
-        "Name": {"type": "title"},
-        "Rating": {"type": "number"},
-        "Cuisine": {"type": "multi_select"},
-        "Location": {"type": "rich_text"},
-        "Date Visited": {"type": "date"},
-        "Notes": {"type": "rich_text"},
-        "Google Place ID": {"type": "rich_text"},
-        "Price Range": {"type": "select"},
-        "Vibes": {"type": "multi_select"},
-        "Revisit": {"type": "checkbox"},
-        "Wishlist": {"type": "checkbox"},
-        "City": {"type": "rich_text"},
-        "State": {"type": "rich_text"},
-    }
-
-
-class RecommendationSession(BaseModel):
-    """Interactive recommendation session model."""
-    session_id: str
-    user_id: str
-    context: RecommendationContext
-    recommendations: List[Recommendation] = []
-    feedback: Dict[str, Any] = {}
-    learned_preferences: UserPreferences = Field(default_factory=UserPreferences)
-    created_at: datetime = Field(default_factory=datetime.now)
-    updated_at: datetime = Field(default_factory=datetime.now)
+    # Shallow copy of the shared layout instead of deep-copying a mutable default
+    properties: Dict[str, Any] = Field(default_factory=lambda: dict(DEFAULT_NOTION_PROPERTIES))
 
 
 class SessionFeedback(BaseModel):
@@ -212,6 +295,18 @@ class SessionFeedback(BaseModel):
     timestamp: datetime = Field(default_factory=datetime.now)
 
 
+class RecommendationSession(BaseModel):
+    """Interactive recommendation session model."""
+    session_id: str
+    user_id: str
+    context: RecommendationContext
+    recommendations: List[Recommendation] = []
+    feedback: List[SessionFeedback] = []
+    learned_preferences: UserPreferences = Field(default_factory=UserPreferences)
+    created_at: datetime = Field(default_factory=datetime.now)
+    updated_at: datetime = Field(default_factory=datetime.now)
+
+
 class SystemStatus(BaseModel):
     """System status model."""
     notion_connected: bool
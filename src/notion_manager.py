@@ -1,41 +1,195 @@
 """Notion API client for restaurant database operations."""
 
 import logging
-from typing import Dict, List, Optional, Any
-from datetime import datetime
+import time
+from functools import lru_cache
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+from datetime import datetime, timezone
 import asyncio
 from notion_client import AsyncClient
-from notion_client.errors import APIResponseError
+from notion_client.errors import HTTPResponseError, RequestTimeoutError
 
 from .models import (
-    Restaurant, Location, CuisineType, PriceRange, VibeType,
-    GooglePlacesData, NotionDatabaseSchema
+    Restaurant, Location, GooglePlacesData, NotionDatabaseSchema,
+    CUISINE_BY_VALUE, PRICE_RANGE_BY_VALUE, VIBE_BY_VALUE
 )
-from .config import settings
+from .config import get_settings
+from .cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# Notion property value wrappers
+def _title(text: str) -> Dict[str, Any]:
+    return {"title": [{"text": {"content": text}}]}
+
+
+def _rich_text(text: str) -> Dict[str, Any]:
+    return {"rich_text": [{"text": {"content": text}}]}
+
+
+def _number(value: float) -> Dict[str, Any]:
+    return {"number": value}
+
+
+def _select(name: str) -> Dict[str, Any]:
+    return {"select": {"name": name}}
+
+
+def _multi_select(names: List[str]) -> Dict[str, Any]:
+    return {"multi_select": [{"name": name} for name in names]}
+
+
+def _checkbox(checked: bool) -> Dict[str, Any]:
+    return {"checkbox": checked}
+
+
+# Restaurant -> Notion property builders, always written
+_PROPERTY_BUILDERS = (
+    ("Name", lambda r: _title(r.name)),
+    ("City", lambda r: _rich_text(r.location.city)),
+    ("Wishlist", lambda r: _checkbox(r.is_wishlist)),
+)
+
+# (property, include?, builder) for properties only written when set
+_OPTIONAL_PROPERTY_BUILDERS = (
+    ("State", lambda r: r.location.state, lambda r: _rich_text(r.location.state)),
+    ("Location", lambda r: r.location.address, lambda r: _rich_text(r.location.address)),
+    ("Score", lambda r: r.personal_rating, lambda r: _number(r.personal_rating)),
+    ("Cuisine", lambda r: r.cuisine_types,
+     lambda r: _multi_select([c.value for c in r.cuisine_types])),
+    ("Price Range", lambda r: r.price_range, lambda r: _select(r.price_range.value)),
+    ("Vibes", lambda r: r.vibes, lambda r: _multi_select([v.value for v in r.vibes])),
+    ("Extra Notes", lambda r: r.notes, lambda r: _rich_text(r.notes)),
+    ("Date", lambda r: r.date_visited,
+     lambda r: {"date": {"start": r.date_visited.isoformat()}}),
+    ("Revisit", lambda r: r.revisit is not None, lambda r: _checkbox(r.revisit)),
+    ("Google Place ID", lambda r: r.google_places_data and r.google_places_data.place_id,
+     lambda r: _rich_text(r.google_places_data.place_id)),
+)
+
+
+def _plain_text(prop: Dict[str, Any], kind: str) -> str:
+    """Return the plain text of the first ``title``/``rich_text`` item of a property."""
+    items = prop.get(kind)
+    return items[0].get("plain_text", "") if items else ""
+
+
+def _first_option(prop: Dict[str, Any]) -> str:
+    """Return the name of the first option of a ``multi_select`` property."""
+    items = prop.get("multi_select")
+    return items[0].get("name", "") if items else ""
+
+
+def _notion_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parse a Notion page timestamp (ISO 8601, UTC) as a naive local datetime."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed.astimezone().replace(tzinfo=None)
+
+
+# How long a full database fetch is reused before hitting Notion again
+_ALL_RESTAURANTS_TTL_SECONDS = 30
+
+# How long a successful connection test is reported without re-checking
+_CONNECTION_TEST_TTL_SECONDS = 30
+
+# What the Notion client raises for a failed request: API errors, responses
+# without a recognisable error body (e.g. gateway 502/503/504) and timeouts
+_NOTION_ERRORS = (HTTPResponseError, RequestTimeoutError)
+
+# Writes hit by rate limiting (429), a server error or a timeout are retried
+# with exponential backoff, honouring Retry-After when Notion sends it
+_WRITE_RETRIES = 5
+_RETRY_BASE_DELAY_SECONDS = 0.5
+
+# Writes are spaced to stay under Notion's average of 3 requests per second
+_WRITE_INTERVAL_SECONDS = 1 / 3
+
+# Page ids never change, so name -> page id survives writes; the TTL only
+# bounds how long a page renamed or deleted in Notion is remembered
+_PAGE_ID_TTL_SECONDS = 600
+
 
 class NotionManager:
     """Manages Notion API interactions for restaurant data."""
     
     def __init__(self, api_key: str = None, database_id: str = None):
         """Initialize Notion client."""
+        settings = get_settings()
         self.api_key = api_key or settings.notion_api_key
         self.database_id = database_id or settings.notion_database_id
         self.client = AsyncClient(auth=self.api_key)
         self.schema = NotionDatabaseSchema(database_id=self.database_id)
+        
+        # Short-lived cache of the full database; `revision` is bumped on writes
+        # and whenever a fresh copy is fetched, so derived caches can key on it
+        self._all_restaurants_cache = TTLCache(maxsize=1, ttl=_ALL_RESTAURANTS_TTL_SECONDS)
+        self._by_name_cache = TTLCache(maxsize=256, ttl=_ALL_RESTAURANTS_TTL_SECONDS)
+        # Recent visits, favorites and wishlist queries, keyed by their arguments
+        self._query_cache = TTLCache(maxsize=64, ttl=_ALL_RESTAURANTS_TTL_SECONDS)
+        self.revision = 0
+        # Earliest time (time.monotonic) the next write may be sent
+        self._next_write_at = 0.0
+        self._connection_cache = TTLCache(maxsize=1, ttl=_CONNECTION_TEST_TTL_SECONDS)
+        self._page_ids = TTLCache(maxsize=512, ttl=_PAGE_ID_TTL_SECONDS)
+    
+    def invalidate_cache(self) -> None:
+        """Drop cached query results after the database changes."""
+        self._all_restaurants_cache.clear()
+        self._by_name_cache.clear()
+        self._query_cache.clear()
+        self.revision += 1
+    
+    async def _pace_write(self) -> None:
+        """Wait for this write's slot so concurrent writes are sent in order, evenly spaced."""
+        # No await between reading and reserving the slot, so no lock is needed
+        now = time.monotonic()
+        send_at = max(now, self._next_write_at)
+        self._next_write_at = send_at + _WRITE_INTERVAL_SECONDS
+        if send_at > now:
+            await asyncio.sleep(send_at - now)
+    
+    async def _with_retries(self, request: Callable[[], Awaitable[Any]]) -> Any:
+        """Await ``request()`` at a paced rate, retrying rate limits, server errors and timeouts."""
+        for attempt in range(_WRITE_RETRIES):
+            await self._pace_write()
+            try:
+                return await request()
+            except _NOTION_ERRORS as e:
+                # Timeouts have no status
+                status = getattr(e, "status", None)
+                retryable = status is None or status == 429 or status >= 500
+                if attempt == _WRITE_RETRIES - 1 or not retryable:
+                    raise
+                delay = _RETRY_BASE_DELAY_SECONDS * 2 ** attempt
+                try:
+                    delay = float(e.headers.get("retry-after", delay))
+                except (AttributeError, ValueError):
+                    pass
+                logger.warning(f"Notion returned {status or 'a timeout'}, retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
     
     async def test_connection(self) -> Dict[str, Any]:
         """Test Notion API connection."""
+        # Status checks poll this; reuse a recent successful result
+        cached = self._connection_cache.get("status")
+        if cached is not None:
+            return cached
+        
         try:
             # Test by retrieving database info
             database = await self.client.databases.retrieve(self.database_id)
-            return {
+            result = {
                 "success": True,
                 "database_title": database.get("title", [{}])[0].get("plain_text", "Unknown"),
                 "database_id": self.database_id
             }
+            self._connection_cache.set("status", result)
+            return result
         except Exception as e:
             logger.error(f"Notion connection test failed: {e}")
             return {"success": False, "error": str(e)}
@@ -45,12 +199,15 @@ class NotionManager:
         try:
             properties = self._build_notion_properties(restaurant)
             
-            response = await self.client.pages.create(
+            response = await self._with_retries(lambda: self.client.pages.create(
                 parent={"database_id": self.database_id},
                 properties=properties
-            )
+            ))
             
             restaurant.notion_page_id = response["id"]
+            if restaurant.name not in self._page_ids:
+                self._page_ids.set(restaurant.name, response["id"])
+            self.invalidate_cache()
             
             return {
                 "success": True,
@@ -58,7 +215,7 @@ class NotionManager:
                 "restaurant_id": restaurant.id,
                 "message": f"Added restaurant '{restaurant.name}' to Notion database"
             }
-        except APIResponseError as e:
+        except _NOTION_ERRORS as e:
             logger.error(f"Failed to add restaurant to Notion: {e}")
             return {"success": False, "error": str(e)}
     
@@ -67,196 +224,355 @@ class NotionManager:
         try:
             properties = self._build_notion_properties(restaurant)
             
-            response = await self.client.pages.update(
+            await self._with_retries(lambda: self.client.pages.update(
                 page_id=page_id,
                 properties=properties
-            )
+            ))
+            self.invalidate_cache()
             
             return {
                 "success": True,
                 "page_id": page_id,
                 "message": f"Updated restaurant '{restaurant.name}' in Notion database"
             }
-        except APIResponseError as e:
+        except _NOTION_ERRORS as e:
             logger.error(f"Failed to update restaurant in Notion: {e}")
             return {"success": False, "error": str(e)}
     
+    async def update_restaurants_batch(
+        self,
+        updates: List[Tuple[str, Restaurant]]
+    ) -> List[Dict[str, Any]]:
+        """Update several restaurants concurrently, one result per ``(page_id, restaurant)``.
+        
+        Notion has no bulk update endpoint; the writes share the client's
+        connection pool and are paced like any other write. A failed update
+        is reported in its own result without affecting the others.
+        """
+        results = await asyncio.gather(
+            *[self.update_restaurant(page_id, restaurant) for page_id, restaurant in updates],
+            return_exceptions=True
+        )
+        return [
+            {"success": False, "error": str(result) or type(result).__name__}
+            if isinstance(result, BaseException) else result
+            for result in results
+        ]
+    
+    async def update_rating(
+        self,
+        page_id: str,
+        rating: float,
+        notes: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Update only the rating (and optionally the notes) of a restaurant page."""
+        try:
+            properties = {"Score": _number(rating)}
+            if notes:
+                properties["Extra Notes"] = _rich_text(notes)
+            
+            await self._with_retries(
+                lambda: self.client.pages.update(page_id=page_id, properties=properties)
+            )
+            self.invalidate_cache()
+            
+            return {
+                "success": True,
+                "page_id": page_id,
+                "message": "Updated restaurant rating in Notion database"
+            }
+        except _NOTION_ERRORS as e:
+            logger.error(f"Failed to update restaurant rating in Notion: {e}")
+            return {"success": False, "error": str(e)}
+    
     async def get_restaurant_by_id(self, page_id: str) -> Optional[Restaurant]:
         """Get restaurant by Notion page ID."""
         try:
             response = await self.client.pages.retrieve(page_id)
             return self._parse_notion_page_to_restaurant(response)
-        except APIResponseError as e:
+        except _NOTION_ERRORS as e:
             logger.error(f"Failed to get restaurant by ID: {e}")
             return None
     
     async def get_restaurant_by_name(self, name: str) -> Optional[Restaurant]:
         """Find restaurant by name."""
         try:
-            response = await self.client.databases.query(
-                database_id=self.database_id,
-                filter={
-                    "property": "Name",
-                    "title": {"equals": name}
-                }
+            restaurant = await self._by_name_cache.get_or_set(
+                name, lambda: self._fetch_restaurant_by_name(name)
             )
-            
-            if response["results"]:
-                return self._parse_notion_page_to_restaurant(response["results"][0])
-            return None
-        except APIResponseError as e:
+            # Callers update the returned model (and its location) before writing it back
+            return restaurant.model_copy(deep=True) if restaurant else None
+        except _NOTION_ERRORS as e:
             logger.error(f"Failed to get restaurant by name: {e}")
             return None
     
+    async def get_page_id_by_name(self, name: str) -> Optional[str]:
+        """Find the Notion page id of the restaurant with this exact name."""
+        page_id = self._page_ids.get(name)
+        if page_id is None:
+            restaurant = await self.get_restaurant_by_name(name)
+            page_id = restaurant.notion_page_id if restaurant else None
+        return page_id
+    
+    async def _fetch_restaurant_by_name(self, name: str) -> Optional[Restaurant]:
+        """Query the database for the first restaurant with this exact name."""
+        response = await self.client.databases.query(
+            database_id=self.database_id,
+            filter={
+                "property": "Name",
+                "title": {"equals": name}
+            }
+        )
+        
+        if response["results"]:
+            restaurant = self._parse_notion_page_to_restaurant(response["results"][0])
+            if restaurant and restaurant.notion_page_id:
+                self._page_ids.set(name, restaurant.notion_page_id)
+            return restaurant
+        return None
+    
     async def query_restaurants(self, filters: Dict[str, Any] = None, limit: int = 100) -> List[Restaurant]:
         """Query restaurants with optional filters."""
         try:
-            query_params = {
-                "database_id": self.database_id,
-                "page_size": min(limit, 100)
-            }
-            
-            if filters:
-                query_params["filter"] = self._build_notion_filter(filters)
-            
-            response = await self.client.databases.query(**query_params)
+            notion_filter = self._build_notion_filter(filters) if filters else None
             
             restaurants = []
-            for page in response["results"]:
-                restaurant = self._parse_notion_page_to_restaurant(page)
-                if restaurant:
+            pages = self.iter_restaurants(notion_filter, page_size=min(limit, 100))
+            try:
+                async for restaurant in pages:
                     restaurants.append(restaurant)
+                    if len(restaurants) >= limit:
+                        break
+            finally:
+                await pages.aclose()
             
             return restaurants
-        except APIResponseError as e:
+        except _NOTION_ERRORS as e:
             logger.error(f"Failed to query restaurants: {e}")
             return []
     
     async def get_all_restaurants(self) -> List[Restaurant]:
         """Get all restaurants from Notion database."""
-        return await self.query_restaurants()
+        _, restaurants = await self.get_all_restaurants_with_revision()
+        # Callers may sort/filter the list in place; hand out a copy
+        return list(restaurants)
+    
+    async def get_all_restaurants_with_revision(self) -> Tuple[int, List[Restaurant]]:
+        """Get all restaurants together with the ``revision`` they were fetched at.
+        
+        Derived caches should key on the returned revision rather than reading
+        ``self.revision`` around the await, which a refetch or write can move
+        meanwhile. The list is shared; callers must treat it as read-only.
+        """
+        try:
+            return await self._all_restaurants_cache.get_or_set(
+                "all", self._fetch_all_restaurants
+            )
+        except _NOTION_ERRORS as e:
+            logger.error(f"Failed to get all restaurants: {e}")
+            return self.revision, []
+    
+    async def _fetch_all_restaurants(self) -> Tuple[int, List[Restaurant]]:
+        """Fetch and parse every restaurant in the database."""
+        revision = self.revision
+        restaurants = [restaurant async for restaurant in self.iter_restaurants()]
+        # If a write invalidated the cache meanwhile, these may predate it; keep
+        # the older revision so derived caches don't take them as current
+        if self.revision == revision:
+            self.revision += 1
+            revision = self.revision
+        return revision, restaurants
+    
+    async def iter_restaurants(
+        self,
+        filter_: Optional[Dict[str, Any]] = None,
+        sorts: Optional[List[Dict[str, Any]]] = None,
+        page_size: int = 100
+    ) -> AsyncIterator[Restaurant]:
+        """Yield restaurants page by page, following Notion's cursors.
+        
+        The next page is fetched while the current one is parsed (in the
+        default executor), and callers can stop early without paying for the
+        rest of the database.
+        """
+        loop = asyncio.get_running_loop()
+        query_params = {"database_id": self.database_id, "page_size": page_size}
+        if filter_:
+            query_params["filter"] = filter_
+        if sorts:
+            query_params["sorts"] = sorts
+        
+        next_query = asyncio.ensure_future(self.client.databases.query(**query_params))
+        try:
+            while next_query is not None:
+                response = await next_query
+                next_query = None
+                
+                if response.get("has_more") and response.get("next_cursor"):
+                    query_params["start_cursor"] = response["next_cursor"]
+                    next_query = asyncio.ensure_future(
+                        self.client.databases.query(**query_params)
+                    )
+                
+                batch = await loop.run_in_executor(None, self._parse_batch, response["results"])
+                for restaurant in batch:
+                    yield restaurant
+        finally:
+            # Don't leave a prefetch running if the caller stopped early
+            if next_query is not None:
+                next_query.cancel()
+    
+    def _parse_batch(self, pages: List[Dict[str, Any]]) -> List[Restaurant]:
+        """Parse a batch of Notion pages, dropping any that fail to parse."""
+        restaurants = []
+        for page in pages:
+            restaurant = self._parse_notion_page_to_restaurant(page)
+            if restaurant:
+                restaurants.append(restaurant)
+        return restaurants
     
     async def get_recent_visits(self, limit: int = 10) -> List[Restaurant]:
         """Get recently visited restaurants."""
         try:
-            response = await self.client.databases.query(
-                database_id=self.database_id,
-                filter={
-                    "property": "Date Visited",
-                    "date": {"is_not_empty": True}
-                },
-                sorts=[{
-                    "property": "Date Visited",
-                    "direction": "descending"
-                }],
-                page_size=limit
+            restaurants = await self._query_cache.get_or_set(
+                ("recent", limit),
+                lambda: self._fetch_query(
+                    filter={
+                        "property": "Date Visited",
+                        "date": {"is_not_empty": True}
+                    },
+                    sorts=[{
+                        "property": "Date Visited",
+                        "direction": "descending"
+                    }],
+                    page_size=limit
+                )
             )
-            
-            restaurants = []
-            for page in response["results"]:
-                restaurant = self._parse_notion_page_to_restaurant(page)
-                if restaurant:
-                    restaurants.append(restaurant)
-            
-            return restaurants
-        except APIResponseError as e:
+            return list(restaurants)
+        except _NOTION_ERRORS as e:
             logger.error(f"Failed to get recent visits: {e}")
             return []
     
     async def get_favorites(self, min_rating: float = 4.0, limit: int = 20) -> List[Restaurant]:
         """Get favorite restaurants (highly rated)."""
         try:
-            response = await self.client.databases.query(
-                database_id=self.database_id,
-                filter={
-                    "property": "Rating",
-                    "number": {"greater_than_or_equal_to": min_rating}
-                },
-                sorts=[{
-                    "property": "Rating",
-                    "direction": "descending"
-                }],
-                page_size=limit
+            restaurants = await self._query_cache.get_or_set(
+                ("favorites", min_rating, limit),
+                lambda: self._fetch_query(
+                    filter={
+                        "property": "Rating",
+                        "number": {"greater_than_or_equal_to": min_rating}
+                    },
+                    sorts=[{
+                        "property": "Rating",
+                        "direction": "descending"
+                    }],
+                    page_size=limit
+                )
             )
-            
-            restaurants = []
-            for page in response["results"]:
-                restaurant = self._parse_notion_page_to_restaurant(page)
-                if restaurant:
-                    restaurants.append(restaurant)
-            
-            return restaurants
-        except APIResponseError as e:
+            return list(restaurants)
+        except _NOTION_ERRORS as e:
             logger.error(f"Failed to get favorites: {e}")
             return []
     
     async def get_wishlist(self, limit: int = 50) -> List[Restaurant]:
         """Get wishlist restaurants."""
         try:
-            response = await self.client.databases.query(
-                database_id=self.database_id,
-                filter={
-                    "property": "Wishlist",
-                    "checkbox": {"equals": True}
-                },
-                page_size=limit
+            restaurants = await self._query_cache.get_or_set(
+                ("wishlist", limit),
+                lambda: self._fetch_query(
+                    filter={
+                        "property": "Wishlist",
+                        "checkbox": {"equals": True}
+                    },
+                    page_size=limit
+                )
             )
-            
-            restaurants = []
-            for page in response["results"]:
-                restaurant = self._parse_notion_page_to_restaurant(page)
-                if restaurant:
-                    restaurants.append(restaurant)
-            
-            return restaurants
-        except APIResponseError as e:
+            return list(restaurants)
+        except _NOTION_ERRORS as e:
             logger.error(f"Failed to get wishlist: {e}")
             return []
     
-    def _build_notion_properties(self, restaurant: Restaurant) -> Dict[str, Any]:
-        """Build Notion properties from restaurant model."""
-        properties = {
-            "Name": {"title": [{"text": {"content": restaurant.name}}]},
-            "City": {"rich_text": [{"text": {"content": restaurant.location.city}}]},
-        }
-        
-        if restaurant.location.state:
-            properties["State"] = {"rich_text": [{"text": {"content": restaurant.location.state}}]}
-        
-        if restaurant.location.address:
-            properties["Location"] = {"rich_text": [{"text": {"content": restaurant.location.address}}]}
-        
-        if restaurant.personal_rating:
-            properties["Score"] = {"number": restaurant.personal_rating}
-        
-        if restaurant.cuisine_types:
-            properties["Cuisine"] = {
-                "multi_select": [{"name": cuisine.value} for cuisine in restaurant.cuisine_types]
-            }
-        
-        if restaurant.price_range:
-            properties["Price Range"] = {"select": {"name": restaurant.price_range.value}}
-        
-        if restaurant.vibes:
-            properties["Vibes"] = {
-                "multi_select": [{"name": vibe.value} for vibe in restaurant.vibes]
+    async def search_by_name(self, query: str) -> List[Restaurant]:
+        """Get restaurants whose name contains ``query`` (case-insensitive)."""
+        try:
+            notion_filter = {"property": "Name", "title": {"contains": query}}
+            restaurants = await self._query_cache.get_or_set(
+                ("name", query.casefold()),
+                lambda: self._fetch_matching(notion_filter)
+            )
+            return list(restaurants)
+        except _NOTION_ERRORS as e:
+            logger.error(f"Failed to search restaurants by name: {e}")
+            return []
+    
+    async def _fetch_matching(self, filter_: Dict[str, Any]) -> List[Restaurant]:
+        """Fetch and parse every restaurant matching a Notion filter."""
+        return [restaurant async for restaurant in self.iter_restaurants(filter_)]
+    
+    async def get_restaurants_edited_since(self, since: datetime) -> List[Restaurant]:
+        """Get restaurants whose pages were edited on or after ``since``."""
+        try:
+            # Notion reads offset-less timestamps as UTC; naive datetimes here are local
+            notion_filter = {
+                "timestamp": "last_edited_time",
+                "last_edited_time": {"on_or_after": since.astimezone(timezone.utc).isoformat()}
             }
+            return [restaurant async for restaurant in self.iter_restaurants(notion_filter)]
+        except _NOTION_ERRORS as e:
+            logger.error(f"Failed to get restaurants edited since {since}: {e}")
+            return []
+    
+    async def get_restaurants_missing_place_id(self, limit: int = 20) -> List[Restaurant]:
+        """Get restaurants that have not been matched to a Google place yet."""
+        try:
+            return await self._fetch_query(
+                filter={
+                    "property": "Google Place ID",
+                    "rich_text": {"is_empty": True}
+                },
+                page_size=max(1, min(limit, 100))
+            )
+        except _NOTION_ERRORS as e:
+            logger.error(f"Failed to get restaurants missing a place id: {e}")
+            return []
+    
+    async def get_restaurants_page(
+        self,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Restaurant], Optional[str]]:
+        """Get one page of restaurants and the cursor of the next page, if any."""
+        try:
+            query_params = {"database_id": self.database_id, "page_size": max(1, min(limit, 100))}
+            if cursor:
+                query_params["start_cursor"] = cursor
+            response = await self.client.databases.query(**query_params)
+            
+            next_cursor = response.get("next_cursor") if response.get("has_more") else None
+            return self._parse_batch(response["results"]), next_cursor
+        except _NOTION_ERRORS as e:
+            logger.error(f"Failed to get restaurants page: {e}")
+            return [], None
+    
+    async def _fetch_query(self, **query: Any) -> List[Restaurant]:
+        """Run a single-page database query and parse the results."""
+        response = await self.client.databases.query(database_id=self.database_id, **query)
         
-        if restaurant.notes:
-            properties["Extra Notes"] = {"rich_text": [{"text": {"content": restaurant.notes}}]}
-        
-        if restaurant.date_visited:
-            properties["Date"] = {"date": {"start": restaurant.date_visited.isoformat()}}
-        
-        if restaurant.revisit is not None:
-            properties["Revisit"] = {"checkbox": restaurant.revisit}
-        
-        properties["Wishlist"] = {"checkbox": restaurant.is_wishlist}
+        restaurants = []
+        for page in response["results"]:
+            restaurant = self._parse_notion_page_to_restaurant(page)
+            if restaurant:
+                restaurants.append(restaurant)
         
-        if restaurant.google_places_data and restaurant.google_places_data.place_id:
-            properties["Google Place ID"] = {
-                "rich_text": [{"text": {"content": restaurant.google_places_data.place_id}}]
-            }
+        return restaurants
+    
+    def _build_notion_properties(self, restaurant: Restaurant) -> Dict[str, Any]:
+        """Build Notion properties from restaurant model."""
+        properties = {key: build(restaurant) for key, build in _PROPERTY_BUILDERS}
+        for key, include, build in _OPTIONAL_PROPERTY_BUILDERS:
+            if include(restaurant):
+                properties[key] = build(restaurant)
         
         return properties
     
@@ -266,16 +582,11 @@ class NotionManager:
             properties = page.get("properties", {})
             
             # Required fields
-            name_prop = properties.get("Name", {})
-            name = name_prop.get("title", [{}])[0].get("plain_text", "")
+            name = _plain_text(properties.get("Name", {}), "title")
             
             # City (can be rich_text or multi_select)
             city_prop = properties.get("City", {}) or properties.get("City ", {})
-            city = ""
-            if city_prop.get("rich_text") and len(city_prop["rich_text"]) > 0:
-                city = city_prop["rich_text"][0].get("plain_text", "")
-            elif city_prop.get("multi_select") and len(city_prop["multi_select"]) > 0:
-                city = city_prop["multi_select"][0].get("name", "")
+            city = _plain_text(city_prop, "rich_text") or _first_option(city_prop)
             
             if not city:
                 # Try getting it from any text fields
@@ -285,20 +596,13 @@ class NotionManager:
                 return None
             
             # Location
-            location_prop = properties.get("Location", {})
-            address = ""
-            if location_prop.get("rich_text") and len(location_prop["rich_text"]) > 0:
-                address = location_prop["rich_text"][0].get("plain_text", "")
+            address = _plain_text(properties.get("Location", {}), "rich_text")
             
             # State (can be rich_text or multi_select)
             state_prop = properties.get("State", {})
-            state = ""
-            if state_prop.get("rich_text") and len(state_prop["rich_text"]) > 0:
-                state = state_prop["rich_text"][0].get("plain_text", "")
-            elif state_prop.get("multi_select") and len(state_prop["multi_select"]) > 0:
-                state = state_prop["multi_select"][0].get("name", "")
+            state = _plain_text(state_prop, "rich_text") or _first_option(state_prop)
             
-            location = Location(
+            location = Location.from_trusted(
                 address=address or None,
                 city=city,
                 state=state or None
@@ -308,47 +612,32 @@ class NotionManager:
             rating_prop = properties.get("Rating", {}) or properties.get("Score", {})
             rating = None
             if rating_prop.get("number"):
-                rating = rating_prop.get("number")
+                rating = float(rating_prop.get("number"))
             elif rating_prop.get("select") and rating_prop["select"].get("name"):
                 # Convert star ratings to numbers
                 star_text = rating_prop["select"]["name"]
-                rating = star_text.count("⭐") if "⭐" in star_text else None
+                rating = float(star_text.count("⭐")) if "⭐" in star_text else None
             
-            # Cuisine types
-            cuisine_prop = properties.get("Cuisine", {})
-            cuisine_types = []
-            for cuisine_option in cuisine_prop.get("multi_select", []):
-                try:
-                    cuisine_types.append(CuisineType(cuisine_option["name"]))
-                except ValueError:
-                    pass  # Skip invalid cuisine types
+            # Cuisine types (unknown options are skipped, order is kept)
+            cuisine_names = [o["name"] for o in properties.get("Cuisine", {}).get("multi_select", ())]
+            cuisine_types = [CUISINE_BY_VALUE[n] for n in cuisine_names if n in CUISINE_BY_VALUE]
             
             # Price range
             price_prop = properties.get("Price Range", {})
             price_range = None
             if price_prop.get("select"):
-                try:
-                    price_range = PriceRange(price_prop["select"]["name"])
-                except ValueError:
-                    pass
+                price_range = PRICE_RANGE_BY_VALUE.get(price_prop["select"]["name"])
             
-            # Vibes
-            vibes_prop = properties.get("Vibes", {})
-            vibes = []
-            for vibe_option in vibes_prop.get("multi_select", []):
-                try:
-                    vibes.append(VibeType(vibe_option["name"]))
-                except ValueError:
-                    pass  # Skip invalid vibe types
+            # Vibes (unknown options are skipped, order is kept)
+            vibe_names = [o["name"] for o in properties.get("Vibes", {}).get("multi_select", ())]
+            vibes = [VIBE_BY_VALUE[n] for n in vibe_names if n in VIBE_BY_VALUE]
             
             # Notes (check "Notes", "Items tried", and "Extra Notes")
             notes_parts = []
             for notes_field in ["Notes", "Items tried", "Extra Notes"]:
-                notes_prop = properties.get(notes_field, {})
-                if notes_prop.get("rich_text") and len(notes_prop["rich_text"]) > 0:
-                    notes_text = notes_prop["rich_text"][0].get("plain_text", "")
-                    if notes_text:
-                        notes_parts.append(f"{notes_field}: {notes_text}")
+                notes_text = _plain_text(properties.get(notes_field, {}), "rich_text")
+                if notes_text:
+                    notes_parts.append(f"{notes_field}: {notes_text}")
             notes = "; ".join(notes_parts) if notes_parts else ""
             
             # Date visited (check both "Date Visited" and "Date")
@@ -369,19 +658,21 @@ class NotionManager:
             is_wishlist = wishlist_prop.get("checkbox", False)
             
             # Google Places data
-            google_place_id_prop = properties.get("Google Place ID", {})
-            google_place_id = ""
-            if google_place_id_prop.get("rich_text") and len(google_place_id_prop["rich_text"]) > 0:
-                google_place_id = google_place_id_prop["rich_text"][0].get("plain_text", "")
+            google_place_id = _plain_text(properties.get("Google Place ID", {}), "rich_text")
             
             google_places_data = None
             if google_place_id:
-                google_places_data = GooglePlacesData(
+                google_places_data = GooglePlacesData.from_trusted(
                     place_id=google_place_id,
                     name=name
                 )
             
-            return Restaurant(
+            # When the page was last edited, so sync passes can tell what changed
+            updated_at = _notion_timestamp(page.get("last_edited_time")) or datetime.now()
+            
+            # Every field above is already normalized to its model type, so skip
+            # re-validation (user-supplied restaurants are still validated)
+            return Restaurant.from_trusted(
                 id=page["id"],
                 name=name,
                 location=location,
@@ -394,7 +685,8 @@ class NotionManager:
                 revisit=revisit,
                 is_wishlist=is_wishlist,
                 google_places_data=google_places_data,
-                notion_page_id=page["id"]
+                notion_page_id=page["id"],
+                updated_at=updated_at
             )
             
         except Exception as e:
@@ -403,26 +695,40 @@ class NotionManager:
     
     def _build_notion_filter(self, filters: Dict[str, Any]) -> Dict[str, Any]:
         """Build Notion filter from filter dictionary."""
-        # This is a simplified implementation
-        # You can expand this based on your filtering needs
-        notion_filter = {}
-        
-        if "cuisine" in filters:
-            notion_filter = {
-                "property": "Cuisine",
-                "multi_select": {"contains": filters["cuisine"]}
-            }
-        
-        if "city" in filters:
-            notion_filter = {
-                "property": "City",
-                "rich_text": {"equals": filters["city"]}
-            }
-        
-        if "min_rating" in filters:
-            notion_filter = {
-                "property": "Rating",
-                "number": {"greater_than_or_equal_to": filters["min_rating"]}
-            }
-        
-        return notion_filter
\ No newline at end of file
+        try:
+            return _build_notion_filter_cached(tuple(sorted(filters.items())))
+        except TypeError:
+            # Unhashable filter values can't be memoized
+            return _build_notion_filter_cached.__wrapped__(tuple(filters.items()))
+
+
+@lru_cache(maxsize=256)
+def _build_notion_filter_cached(items: Tuple[Tuple[str, Any], ...]) -> Dict[str, Any]:
+    """Build a Notion filter from sorted (key, value) filter items.
+
+    The result is shared between callers with equal filters; do not mutate it.
+    """
+    # This is a simplified implementation
+    # You can expand this based on your filtering needs
+    filters = dict(items)
+    notion_filter = {}
+    
+    if "cuisine" in filters:
+        notion_filter = {
+            "property": "Cuisine",
+            "multi_select": {"contains": filters["cuisine"]}
+        }
+    
+    if "city" in filters:
+        notion_filter = {
+            "property": "City",
+            "rich_text": {"equals": filters["city"]}
+        }
+    
+    if "min_rating" in filters:
+        notion_filter = {
+            "property": "Rating",
+            "number": {"greater_than_or_equal_to": filters["min_rating"]}
+        }
+    
+    return notion_filter
@@ -0,0 +1,181 @@
+"""Column-oriented snapshots of restaurant lists for the recommendation hot path."""
+
+import math
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .models import CuisineType, PriceRange, Restaurant, VibeType
+
+# One bit per enum member; Python ints make the masks as wide as needed
+CUISINE_BITS: Dict[CuisineType, int] = {cuisine: 1 << i for i, cuisine in enumerate(CuisineType)}
+VIBE_BITS: Dict[VibeType, int] = {vibe: 1 << i for i, vibe in enumerate(VibeType)}
+
+# Display strings, so hot loops do a dict lookup instead of the Enum.value property
+CUISINE_LABELS: Dict[CuisineType, str] = {cuisine: cuisine.value for cuisine in CuisineType}
+VIBE_LABELS: Dict[VibeType, str] = {vibe: vibe.value for vibe in VibeType}
+
+
+def cuisine_mask(cuisines: Iterable[CuisineType]) -> int:
+    """Encode a collection of cuisines as a bitmask (unknown values are ignored)."""
+    mask = 0
+    for cuisine in cuisines:
+        mask |= CUISINE_BITS.get(cuisine, 0)
+    return mask
+
+
+def vibe_mask(vibes: Iterable[VibeType]) -> int:
+    """Encode a collection of vibes as a bitmask (unknown values are ignored)."""
+    mask = 0
+    for vibe in vibes:
+        mask |= VIBE_BITS.get(vibe, 0)
+    return mask
+
+
+def radian_coordinates(
+    latitude: Optional[float],
+    longitude: Optional[float]
+) -> Optional[Tuple[float, float, float]]:
+    """Return ``(lat, lon, cos(lat))`` in radians, or ``None`` without both coordinates."""
+    if not (latitude and longitude):
+        return None
+    lat = math.radians(latitude)
+    return lat, math.radians(longitude), math.cos(lat)
+
+
+def popcount(mask: int) -> int:
+    """Count the set bits in ``mask``."""
+    return bin(mask).count("1")
+
+
+class RestaurantColumns:
+    """Per-field columns derived once from a list of restaurants.
+
+    The recommendation, analysis and similarity code reads the same handful
+    of fields for every restaurant on every request. Extracting them into
+    parallel lists up front means a snapshot built from the (rarely
+    changing) Notion database can be reused until its revision changes.
+    """
+
+    # Columns holding one entry per restaurant, in the same order
+    ROW_COLUMNS = (
+        "restaurants", "keys", "latitudes", "longitudes", "coordinates",
+        "price_ranges", "google_ratings", "visited", "wishlist",
+        "cuisine_masks", "vibe_masks", "exact_masks",
+    )
+    __slots__ = ROW_COLUMNS + ("rated_restaurants",)
+
+    def __init__(self, restaurants: Sequence[Restaurant]):
+        """Build the columns from ``restaurants``."""
+        self.restaurants: List[Restaurant] = list(restaurants)
+        # Lower-cased "name<US>city", used to de-duplicate across sources. A
+        # single str (unlike a tuple) caches its hash, so the Notion snapshot's
+        # keys are hashed once, not on every request.
+        self.keys: List[str] = []
+        self.latitudes: List[Optional[float]] = []
+        self.longitudes: List[Optional[float]] = []
+        # Radians (plus cos(lat)) for the haversine, see radian_coordinates
+        self.coordinates: List[Optional[Tuple[float, float, float]]] = []
+        self.price_ranges: List[Optional[PriceRange]] = []
+        self.google_ratings: List[Optional[float]] = []
+        self.visited: List[bool] = []
+        self.wishlist: List[bool] = []
+        self.cuisine_masks: List[int] = []
+        self.vibe_masks: List[int] = []
+        # True when the cuisine and vibe lists have no repeats or unknown values,
+        # so counting mask bits gives the same answer as scanning the lists
+        self.exact_masks: List[bool] = []
+        # Restaurants with a personal rating (actual visits)
+        self.rated_restaurants: List[Restaurant] = []
+
+        for restaurant in self.restaurants:
+            location = restaurant.location
+            self.keys.append(f"{restaurant.name.lower()}\x1f{location.city.lower()}")
+            self.latitudes.append(location.latitude)
+            self.longitudes.append(location.longitude)
+            self.coordinates.append(radian_coordinates(location.latitude, location.longitude))
+            self.price_ranges.append(restaurant.price_range)
+            places = restaurant.google_places_data
+            self.google_ratings.append(places.rating if places else None)
+            is_visited = restaurant.personal_rating is not None
+            self.visited.append(is_visited)
+            if is_visited:
+                self.rated_restaurants.append(restaurant)
+            self.wishlist.append(restaurant.is_wishlist)
+            cuisines = cuisine_mask(restaurant.cuisine_types)
+            vibes = vibe_mask(restaurant.vibes)
+            self.cuisine_masks.append(cuisines)
+            self.vibe_masks.append(vibes)
+            self.exact_masks.append(
+                popcount(cuisines) == len(restaurant.cuisine_types)
+                and popcount(vibes) == len(restaurant.vibes)
+            )
+
+    def __len__(self) -> int:
+        return len(self.restaurants)
+
+    def select(self, indices: Sequence[int]) -> "RestaurantColumns":
+        """Return a snapshot holding only the rows at ``indices``, in that order."""
+        subset = self.__class__.__new__(self.__class__)
+        for name in self.ROW_COLUMNS:
+            column = getattr(self, name)
+            setattr(subset, name, [column[i] for i in indices])
+        subset.rated_restaurants = [
+            restaurant for restaurant, is_visited in zip(subset.restaurants, subset.visited)
+            if is_visited
+        ]
+        return subset
+
+    @classmethod
+    def concat(cls, *parts: "RestaurantColumns") -> "RestaurantColumns":
+        """Join snapshots end to end without re-deriving any column."""
+        combined = cls.__new__(cls)
+        for name in cls.__slots__:
+            column: list = []
+            for part in parts:
+                column.extend(getattr(part, name))
+            setattr(combined, name, column)
+        return combined
+
+
+class VisitIndex:
+    """Visited restaurants pre-sorted by visit date and by rating.
+    
+    Date and rating range queries become a bisect plus a slice instead of a
+    filter and sort over the whole database. Results come back in the same
+    order the tools used to sort into: most recent first, and highest rated
+    (then most recent) first.
+    """
+
+    __slots__ = ("by_date", "dates", "by_rating", "ratings")
+
+    def __init__(self, restaurants: Sequence[Restaurant]):
+        """Build the indexes from ``restaurants``."""
+        # Descending lists, plus their keys in ascending order for bisect
+        self.by_date: List[Restaurant] = sorted(
+            (r for r in restaurants if r.date_visited),
+            key=lambda r: r.date_visited,
+            reverse=True
+        )
+        self.dates: List[datetime] = [r.date_visited for r in reversed(self.by_date)]
+        self.by_rating: List[Restaurant] = sorted(
+            (r for r in restaurants if r.personal_rating is not None),
+            key=lambda r: (r.personal_rating, r.date_visited or datetime.min),
+            reverse=True
+        )
+        self.ratings: List[float] = [r.personal_rating for r in reversed(self.by_rating)]
+
+    def visited_since(self, cutoff: datetime) -> List[Restaurant]:
+        """Restaurants visited on or after ``cutoff``, most recent first."""
+        return self.by_date[:len(self.dates) - bisect_left(self.dates, cutoff)]
+
+    def rated_between(
+        self,
+        min_rating: Optional[float] = None,
+        max_rating: Optional[float] = None
+    ) -> List[Restaurant]:
+        """Rated restaurants within the (inclusive, optional) bounds, highest first."""
+        n = len(self.ratings)
+        lo = bisect_left(self.ratings, min_rating) if min_rating is not None else 0
+        hi = bisect_right(self.ratings, max_rating) if max_rating is not None else n
+        return self.by_rating[n - hi:n - lo] if lo < hi else []
@@ -1,23 +1,74 @@
 """Restaurant manager with recommendation logic."""
 
 import logging
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, FrozenSet, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
 import asyncio
+import heapq
 from collections import defaultdict, Counter
 import math
+import uuid
+from operator import itemgetter
 
 from .models import (
     Restaurant, UserProfile, UserPreferences, Recommendation,
     RecommendationContext, Location, CuisineType, PriceRange,
     VibeType, OccasionType, RecommendationSession, SessionFeedback
 )
+from .cache import TTLCache
 from .notion_manager import NotionManager
 from .maps_client import GoogleMapsClient
-from .config import settings
+from .restaurant_index import (
+    CUISINE_LABELS, VIBE_LABELS, RestaurantColumns, VisitIndex, cuisine_mask,
+    popcount, radian_coordinates, vibe_mask
+)
 
 logger = logging.getLogger(__name__)
 
+_EARTH_RADIUS_KM = 6371
+
+# Bound once so the haversine kernel does a single global lookup per call
+_sin, _atan2, _sqrt = math.sin, math.atan2, math.sqrt
+
+_MAX_USER_PROFILES = 1024
+_PROFILE_TTL_SECONDS = 3600
+_MAX_SESSIONS = 10_000
+_SESSION_TTL_SECONDS = 3600
+
+# Vibes that suit each occasion, and the same table as vibe bitmasks
+_OCCASION_VIBES: Dict[OccasionType, Tuple[VibeType, ...]] = {
+    OccasionType.DATE_NIGHT: (VibeType.ROMANTIC, VibeType.FINE_DINING),
+    OccasionType.BUSINESS_LUNCH: (VibeType.BUSINESS, VibeType.QUIET),
+    OccasionType.FAMILY_DINNER: (VibeType.FAMILY_FRIENDLY, VibeType.CASUAL),
+    OccasionType.CELEBRATION: (VibeType.FINE_DINING, VibeType.TRENDY),
+    OccasionType.QUICK_BITE: (VibeType.CASUAL, VibeType.COUNTER_SERVICE),
+    OccasionType.WEEKEND_BRUNCH: (VibeType.BRUNCH, VibeType.CASUAL),
+    OccasionType.HAPPY_HOUR: (VibeType.SPORTS_BAR, VibeType.LIVELY),
+    OccasionType.LATE_NIGHT: (VibeType.LATE_NIGHT, VibeType.CASUAL),
+}
+_OCCASION_VIBE_MASKS: Dict[OccasionType, int] = {
+    occasion: vibe_mask(vibes) for occasion, vibes in _OCCASION_VIBES.items()
+}
+
+
+def _haversine_km(
+    point: Optional[Tuple[float, float, float]],
+    origin: Optional[Tuple[float, float, float]]
+) -> Optional[float]:
+    """Haversine distance (km) between two ``radian_coordinates`` tuples."""
+    if point is None or origin is None:
+        return None
+    
+    lat1, lon1, cos_lat1 = point
+    lat2, lon2, cos_lat2 = origin
+    sin_dlat = _sin((lat2 - lat1) * 0.5)
+    sin_dlon = _sin((lon2 - lon1) * 0.5)
+    a = sin_dlat * sin_dlat + cos_lat1 * cos_lat2 * (sin_dlon * sin_dlon)
+    # atan2 stays well-conditioned near antipodal points, where asin(sqrt(a))
+    # loses precision and rounding can push ``a`` just past 1
+    a = min(a, 1.0)
+    return _EARTH_RADIUS_KM * (2 * _atan2(_sqrt(a), _sqrt(1 - a)))
+
 
 class RestaurantManager:
     """Manages restaurant data and provides intelligent recommendations."""
@@ -26,8 +77,16 @@ class RestaurantManager:
         """Initialize restaurant manager."""
         self.notion = notion_client
         self.maps = maps_client
-        self._user_profiles: Dict[str, UserProfile] = {}
-        self._recommendation_sessions: Dict[str, RecommendationSession] = {}
+        # Bounded so long-running servers don't pin every user/session forever.
+        # Profiles are stored as (NotionManager.revision, profile).
+        self._user_profiles = TTLCache(maxsize=_MAX_USER_PROFILES, ttl=_PROFILE_TTL_SECONDS)
+        self._recommendation_sessions = TTLCache(maxsize=_MAX_SESSIONS, ttl=_SESSION_TTL_SECONDS)
+        # Column snapshot of the Notion restaurants, keyed by NotionManager.revision
+        self._notion_columns: Optional[RestaurantColumns] = None
+        self._notion_columns_revision: Optional[int] = None
+        # Date/rating index of the Notion restaurants, keyed the same way
+        self._visit_index: Optional[VisitIndex] = None
+        self._visit_index_revision: Optional[int] = None
     
     async def get_recommendations(
         self,
@@ -36,50 +95,48 @@ class RestaurantManager:
     ) -> List[Recommendation]:
         """Generate personalized restaurant recommendations."""
         try:
-            # Get user profile
-            user_profile = await self._get_or_create_user_profile(user_id)
-            
-            # Get restaurants from Notion
-            notion_restaurants = await self.notion.get_all_restaurants()
+            async def load_notion() -> Tuple[UserProfile, RestaurantColumns]:
+                # Get user profile, then restaurants from Notion (shared cache)
+                user_profile = await self._get_or_create_user_profile(user_id)
+                return user_profile, await self._get_notion_columns()
             
-            # Get additional restaurants from Google Maps if location is provided
-            google_restaurants = []
-            if context.location.latitude and context.location.longitude:
-                google_restaurants = await self._get_google_restaurants(context)
+            # Notion and Google Maps are independent; fetch them concurrently
+            (user_profile, notion_columns), google_restaurants = await asyncio.gather(
+                load_notion(), self._get_google_restaurants(context)
+            )
             
-            # Combine and filter restaurants
-            all_restaurants = self._combine_and_filter_restaurants(
-                notion_restaurants, google_restaurants, user_profile, context
+            # Combine and filter restaurants (distances are computed once, here)
+            candidates, distances = self._combine_and_filter_restaurants(
+                notion_columns, RestaurantColumns(google_restaurants), user_profile, context
             )
             
+            # Score every candidate in one pass
+            scores = self._score_restaurants(candidates, user_profile, context, distances)
+            
+            # Pick the top results by score first (same order as a stable full
+            # sort), so only those get reasoning text and a Recommendation
+            eligible = [i for i, score in enumerate(scores) if score > 0.1]  # Minimum threshold
+            top = heapq.nlargest(context.max_results, eligible, key=scores.__getitem__)
+            
             # Generate recommendations
+            preference_sets = self._preference_sets(user_profile)
             recommendations = []
-            for restaurant in all_restaurants:
-                score = await self._calculate_recommendation_score(
-                    restaurant, user_profile, context
+            for i in top:
+                restaurant, score, distance = candidates.restaurants[i], scores[i], distances[i]
+                reasoning = self._generate_reasoning(
+                    restaurant, user_profile, context, score, distance, preference_sets
                 )
                 
-                if score > 0.1:  # Minimum threshold
-                    reasoning = self._generate_reasoning(
-                        restaurant, user_profile, context, score
-                    )
-                    
-                    distance = self._calculate_distance(
-                        restaurant.location, context.location
-                    )
-                    
-                    recommendation = Recommendation(
-                        restaurant=restaurant,
-                        score=score,
-                        reasoning=reasoning,
-                        distance_km=distance,
-                        context=context
-                    )
-                    recommendations.append(recommendation)
+                recommendation = Recommendation(
+                    restaurant=restaurant,
+                    score=score,
+                    reasoning=reasoning,
+                    distance_km=distance,
+                    context=context
+                )
+                recommendations.append(recommendation)
             
-            # Sort by score and return top results
-            recommendations.sort(key=lambda x: x.score, reverse=True)
-            return recommendations[:context.max_results]
+            return recommendations
             
         except Exception as e:
             logger.error(f"Failed to generate recommendations: {e}")
@@ -139,21 +196,25 @@ class RestaurantManager:
         """Analyze user's dining patterns and preferences."""
         try:
             user_profile = await self._get_or_create_user_profile(user_id)
-            restaurants = await self.notion.get_all_restaurants()
+            columns = await self._get_notion_columns()
+            restaurants = columns.restaurants
+            
+            # Restaurants with ratings (actual visits)
+            rated_restaurants = columns.rated_restaurants
             
-            # Filter restaurants with ratings (actual visits)
-            rated_restaurants = [r for r in restaurants if r.personal_rating is not None]
+            # Every statistic below comes from this single pass
+            stats = self._collect_dining_stats(rated_restaurants)
             
             analysis = {
                 "total_restaurants": len(restaurants),
                 "total_visits": len(rated_restaurants),
                 "average_rating": user_profile.average_rating,
                 "dining_personality": user_profile.dining_personality,
-                "favorite_cuisines": self._analyze_cuisine_preferences(rated_restaurants),
-                "price_comfort_zone": self._analyze_price_preferences(rated_restaurants),
-                "preferred_vibes": self._analyze_vibe_preferences(rated_restaurants),
-                "location_patterns": self._analyze_location_patterns(rated_restaurants),
-                "recent_trends": self._analyze_recent_trends(rated_restaurants),
+                "favorite_cuisines": self._analyze_cuisine_preferences(stats),
+                "price_comfort_zone": self._analyze_price_preferences(stats),
+                "preferred_vibes": self._analyze_vibe_preferences(stats),
+                "location_patterns": self._analyze_location_patterns(stats),
+                "recent_trends": self._analyze_recent_trends(stats),
                 "recommendations_insights": self._generate_insights(user_profile, rated_restaurants)
             }
             
@@ -171,27 +232,26 @@ class RestaurantManager:
     ) -> List[Recommendation]:
         """Find restaurants similar to a given restaurant."""
         try:
-            # Find the reference restaurant
-            reference_restaurant = await self.notion.get_restaurant_by_name(restaurant_name)
-            if not reference_restaurant:
-                return []
-            
             # Get user profile
             user_profile = await self._get_or_create_user_profile(user_id)
             
-            # Get all restaurants
-            all_restaurants = await self.notion.get_all_restaurants()
+            # Get all restaurants, and find the reference among them
+            columns = await self._get_notion_columns()
+            reference_restaurant = next(
+                (r for r in columns.restaurants if r.name == restaurant_name), None
+            )
+            if not reference_restaurant:
+                return []
+            
+            # Score every restaurant against the reference in one pass
+            similarities = self._similarities_to(reference_restaurant, columns)
             
             # Find similar restaurants
             similar_restaurants = []
-            for restaurant in all_restaurants:
+            for restaurant, similarity_score in zip(columns.restaurants, similarities):
                 if restaurant.name == restaurant_name:
                     continue  # Skip the reference restaurant
                 
-                similarity_score = self._calculate_similarity(
-                    reference_restaurant, restaurant
-                )
-                
                 if similarity_score > 0.3:  # Minimum similarity threshold
                     reasoning = f"Similar to {restaurant_name} - shared cuisine types and vibes"
                     
@@ -202,9 +262,8 @@ class RestaurantManager:
                     )
                     similar_restaurants.append(recommendation)
             
-            # Sort by similarity score
-            similar_restaurants.sort(key=lambda x: x.score, reverse=True)
-            return similar_restaurants[:max_results]
+            # Return the most similar, best first
+            return heapq.nlargest(max_results, similar_restaurants, key=lambda x: x.score)
             
         except Exception as e:
             logger.error(f"Failed to find similar restaurants: {e}")
@@ -217,30 +276,33 @@ class RestaurantManager:
             enriched_count = 0
             failed_count = 0
             
-            for restaurant in restaurants:
-                try:
-                    # Skip if already enriched
-                    if restaurant.google_places_data and restaurant.google_places_data.place_id:
-                        continue
-                    
-                    # Enrich with Google Maps data
-                    enriched_restaurant = await self.maps.enrich_restaurant_data(restaurant)
-                    
-                    # Update in Notion if enrichment was successful
-                    if enriched_restaurant.google_places_data:
-                        await self.notion.update_restaurant(
-                            restaurant.notion_page_id,
-                            enriched_restaurant
-                        )
-                        enriched_count += 1
-                    
-                    # Add small delay to avoid rate limiting
-                    await asyncio.sleep(0.1)
-                    
-                except Exception as e:
-                    logger.warning(f"Failed to enrich restaurant {restaurant.name}: {e}")
+            # Skip restaurants that are already enriched
+            pending = [
+                r for r in restaurants
+                if not (r.google_places_data and r.google_places_data.place_id)
+            ]
+            
+            results = await self.maps.enrich_restaurants(pending)
+            
+            # Write back the restaurants that came back with Google data
+            enriched = []
+            for restaurant, result in zip(pending, results):
+                # BaseException: a cancelled lookup comes back as CancelledError
+                if isinstance(result, BaseException):
+                    logger.warning(f"Failed to enrich restaurant {restaurant.name}: {result}")
+                    failed_count += 1
+                elif result.google_places_data:
+                    enriched.append(result)
+            
+            updates = await self.notion.update_restaurants_batch(
+                [(r.notion_page_id, r) for r in enriched]
+            )
+            for update in updates:
+                if update["success"]:
+                    enriched_count += 1
+                else:
+                    # update_restaurant already logged the Notion error
                     failed_count += 1
-                    continue
             
             return {
                 "success": True,
@@ -260,7 +322,7 @@ class RestaurantManager:
         context: RecommendationContext
     ) -> RecommendationSession:
         """Start an interactive recommendation session."""
-        session_id = f"{user_id}_{datetime.now().isoformat()}"
+        session_id = f"{user_id}:{uuid.uuid4().hex}"
         
         session = RecommendationSession(
             session_id=session_id,
@@ -273,7 +335,7 @@ class RestaurantManager:
         session.recommendations = recommendations
         
         # Store session
-        self._recommendation_sessions[session_id] = session
+        self._recommendation_sessions.set(session_id, session)
         
         return session
     
@@ -294,8 +356,10 @@ class RestaurantManager:
             )
             
             # Store feedback
-            session.feedback[feedback.timestamp.isoformat()] = feedback
+            session.feedback.append(feedback)
             session.updated_at = datetime.now()
+            # Re-store to keep an active session from expiring
+            self._recommendation_sessions.set(session_id, session)
             
             return {
                 "success": True,
@@ -327,16 +391,12 @@ class RestaurantManager:
                 session.user_id, updated_context
             )
             
-            # Filter out previously disliked restaurants
-            filtered_recommendations = []
-            for feedback in session.feedback.values():
-                disliked_ids = set(feedback.disliked_restaurants)
-                
-                for rec in recommendations:
-                    if rec.restaurant.id not in disliked_ids:
-                        filtered_recommendations.append(rec)
+            # Filter out restaurants disliked in any feedback round
+            disliked_ids = set()
+            for feedback in session.feedback:
+                disliked_ids.update(feedback.disliked_restaurants)
             
-            return filtered_recommendations
+            return [rec for rec in recommendations if rec.restaurant.id not in disliked_ids]
             
         except Exception as e:
             logger.error(f"Failed to get session recommendations: {e}")
@@ -385,22 +445,60 @@ class RestaurantManager:
     
     # Private helper methods
     
+    async def _get_notion_columns(self) -> RestaurantColumns:
+        """Get a column snapshot of the Notion restaurants.
+        
+        The snapshot is rebuilt only when ``NotionManager.revision`` changes.
+        Callers must treat it as read-only.
+        """
+        revision, restaurants = await self.notion.get_all_restaurants_with_revision()
+        if self._notion_columns is None or self._notion_columns_revision != revision:
+            self._notion_columns = RestaurantColumns(restaurants)
+            self._notion_columns_revision = revision
+        return self._notion_columns
+    
+    async def get_visit_index(self) -> VisitIndex:
+        """Get the Notion restaurants indexed by visit date and rating.
+        
+        Like the column snapshot, the index is rebuilt only when
+        ``NotionManager.revision`` changes. Callers must treat it as read-only.
+        """
+        revision, restaurants = await self.notion.get_all_restaurants_with_revision()
+        if self._visit_index is None or self._visit_index_revision != revision:
+            self._visit_index = VisitIndex(restaurants)
+            self._visit_index_revision = revision
+        return self._visit_index
+    
     async def _get_or_create_user_profile(self, user_id: str) -> UserProfile:
-        """Get or create user profile."""
-        if user_id not in self._user_profiles:
+        """Get or create user profile.
+        
+        Profiles are derived from the Notion data alone, so a cached profile is
+        reused until ``NotionManager.revision`` moves on (a write or a refetch).
+        """
+        entry = self._user_profiles.get(user_id)
+        if entry is None or entry[0] != self.notion.revision:
             await self._update_user_profile(user_id)
-        return self._user_profiles[user_id]
+            entry = self._user_profiles.get(user_id)
+            if entry is None:
+                raise KeyError(user_id)
+        return entry[1]
     
     async def _update_user_profile(self, user_id: str) -> None:
         """Update user profile based on Notion data."""
         try:
-            restaurants = await self.notion.get_all_restaurants()
-            rated_restaurants = [r for r in restaurants if r.personal_rating is not None]
+            columns = await self._get_notion_columns()
+            # The revision the snapshot was built from, not one read before the fetch
+            revision = self._notion_columns_revision
+            restaurants = columns.restaurants
+            rated_restaurants = columns.rated_restaurants
             
             # Calculate basic statistics
             total_restaurants = len(restaurants)
             average_rating = sum(r.personal_rating for r in rated_restaurants) / len(rated_restaurants) if rated_restaurants else None
             
+            # Counters shared by the most-common/frequent-location fields
+            stats = self._collect_dining_stats(rated_restaurants)
+            
             # Analyze preferences
             preferences = self._analyze_preferences(rated_restaurants)
             
@@ -414,13 +512,13 @@ class RestaurantManager:
                 dining_personality=personality,
                 total_restaurants=total_restaurants,
                 average_rating=average_rating,
-                most_common_cuisine=self._get_most_common_cuisine(rated_restaurants),
-                most_common_price_range=self._get_most_common_price_range(rated_restaurants),
-                frequent_locations=self._get_frequent_locations(rated_restaurants),
+                most_common_cuisine=self._get_most_common_cuisine(stats),
+                most_common_price_range=self._get_most_common_price_range(stats),
+                frequent_locations=self._get_frequent_locations(stats),
                 recent_visits=[r.id for r in rated_restaurants[-10:]]
             )
             
-            self._user_profiles[user_id] = profile
+            self._user_profiles.set(user_id, (revision, profile))
             
         except Exception as e:
             logger.error(f"Failed to update user profile: {e}")
@@ -432,56 +530,52 @@ class RestaurantManager:
         if not restaurants:
             return preferences
         
-        # Analyze cuisine preferences
-        cuisine_ratings = defaultdict(list)
+        # One pass: running [total rating, count] per cuisine, price range and vibe
+        cuisine_ratings: Dict[CuisineType, List[float]] = {}
+        price_ratings: Dict[PriceRange, List[float]] = {}
+        vibe_ratings: Dict[VibeType, List[float]] = {}
         for restaurant in restaurants:
-            if restaurant.personal_rating:
-                for cuisine in restaurant.cuisine_types:
-                    cuisine_ratings[cuisine].append(restaurant.personal_rating)
+            rating = restaurant.personal_rating
+            if not rating:
+                continue
+            
+            for cuisine in restaurant.cuisine_types:
+                stats = cuisine_ratings.setdefault(cuisine, [0, 0])
+                stats[0] += rating
+                stats[1] += 1
+            
+            if restaurant.price_range:
+                stats = price_ratings.setdefault(restaurant.price_range, [0, 0])
+                stats[0] += rating
+                stats[1] += 1
+            
+            for vibe in restaurant.vibes:
+                stats = vibe_ratings.setdefault(vibe, [0, 0])
+                stats[0] += rating
+                stats[1] += 1
         
         # Get cuisines with average rating >= 4.0
-        favorite_cuisines = []
-        for cuisine, ratings in cuisine_ratings.items():
-            avg_rating = sum(ratings) / len(ratings)
-            if avg_rating >= 4.0 and len(ratings) >= 2:
-                favorite_cuisines.append(cuisine)
-        
-        preferences.favorite_cuisines = favorite_cuisines
-        
-        # Analyze price preferences
-        price_ratings = defaultdict(list)
-        for restaurant in restaurants:
-            if restaurant.personal_rating and restaurant.price_range:
-                price_ratings[restaurant.price_range].append(restaurant.personal_rating)
+        preferences.favorite_cuisines = [
+            cuisine for cuisine, (total, count) in cuisine_ratings.items()
+            if total / count >= 4.0 and count >= 2
+        ]
         
         # Get most frequently used price range with good ratings
         best_price_range = None
         best_score = 0
-        for price_range, ratings in price_ratings.items():
-            if ratings:
-                avg_rating = sum(ratings) / len(ratings)
-                frequency = len(ratings)
-                score = avg_rating * frequency
-                if score > best_score:
-                    best_score = score
-                    best_price_range = price_range
+        for price_range, (total, count) in price_ratings.items():
+            avg_rating = total / count
+            score = avg_rating * count  # weighted by frequency
+            if score > best_score:
+                best_score = score
+                best_price_range = price_range
         
         preferences.preferred_price_range = best_price_range
         
-        # Analyze vibe preferences
-        vibe_ratings = defaultdict(list)
-        for restaurant in restaurants:
-            if restaurant.personal_rating:
-                for vibe in restaurant.vibes:
-                    vibe_ratings[vibe].append(restaurant.personal_rating)
-        
-        preferred_vibes = []
-        for vibe, ratings in vibe_ratings.items():
-            avg_rating = sum(ratings) / len(ratings)
-            if avg_rating >= 4.0 and len(ratings) >= 2:
-                preferred_vibes.append(vibe)
-        
-        preferences.preferred_vibes = preferred_vibes
+        preferences.preferred_vibes = [
+            vibe for vibe, (total, count) in vibe_ratings.items()
+            if total / count >= 4.0 and count >= 2
+        ]
         
         return preferences
     
@@ -490,14 +584,24 @@ class RestaurantManager:
         if not restaurants:
             return "Unknown"
         
-        # Analyze patterns
-        cuisine_diversity = len(set(c for r in restaurants for c in r.cuisine_types))
-        avg_rating = sum(r.personal_rating for r in restaurants if r.personal_rating) / len([r for r in restaurants if r.personal_rating])
-        
-        price_ranges = [r.price_range for r in restaurants if r.price_range]
-        expensive_count = sum(1 for p in price_ranges if p in [PriceRange.EXPENSIVE, PriceRange.VERY_EXPENSIVE])
+        # Analyze patterns in a single pass
+        cuisines_seen = 0
+        rating_total = 0
+        rated_count = 0
+        expensive_count = 0
+        fine_dining_count = 0
+        for restaurant in restaurants:
+            cuisines_seen |= cuisine_mask(restaurant.cuisine_types)
+            if restaurant.personal_rating:
+                rating_total += restaurant.personal_rating
+                rated_count += 1
+            if restaurant.price_range in (PriceRange.EXPENSIVE, PriceRange.VERY_EXPENSIVE):
+                expensive_count += 1
+            if VibeType.FINE_DINING in restaurant.vibes:
+                fine_dining_count += 1
         
-        fine_dining_count = sum(1 for r in restaurants if VibeType.FINE_DINING in r.vibes)
+        cuisine_diversity = popcount(cuisines_seen)
+        avg_rating = rating_total / rated_count
         
         # Determine personality
         if cuisine_diversity > 10 and avg_rating > 4.0:
@@ -512,35 +616,44 @@ class RestaurantManager:
             return "Casual Explorer"
     
     async def _get_google_restaurants(self, context: RecommendationContext) -> List[Restaurant]:
-        """Get additional restaurants from Google Maps."""
+        """Get additional restaurants from Google Maps (none without a location)."""
+        if not (context.location.latitude and context.location.longitude):
+            return []
+        
         try:
             location = (context.location.latitude, context.location.longitude)
             
-            # Search for restaurants based on preferences
-            all_restaurants = []
+            radius = int(context.max_distance_km * 1000)
             
-            # Search by cuisine preferences
-            for cuisine in context.cuisine_preferences:
-                restaurants_data = await self.maps.search_restaurants(
-                    query=f"{cuisine.value} restaurant",
-                    location=location,
-                    radius=int(context.max_distance_km * 1000)
-                )
-                
-                for data in restaurants_data:
-                    restaurant = self._convert_google_data_to_restaurant(data)
-                    if restaurant:
-                        all_restaurants.append(restaurant)
+            # Search by cuisine preferences, or generally if there are none;
+            # the searches are independent, so run them concurrently
+            queries = [f"{cuisine.value} restaurant" for cuisine in context.cuisine_preferences]
+            if not queries:
+                queries = ["restaurant"]
             
-            # If no specific cuisine preferences, search generally
-            if not context.cuisine_preferences:
-                restaurants_data = await self.maps.search_restaurants(
-                    query="restaurant",
-                    location=location,
-                    radius=int(context.max_distance_km * 1000)
-                )
+            results = await asyncio.gather(
+                *[
+                    self.maps.search_restaurants(query=query, location=location, radius=radius)
+                    for query in queries
+                ],
+                return_exceptions=True
+            )
+            
+            all_restaurants = []
+            seen_place_ids = set()
+            for query, restaurants_data in zip(queries, results):
+                if isinstance(restaurants_data, Exception):
+                    logger.warning(f"Google search for {query!r} failed: {restaurants_data}")
+                    continue
                 
                 for data in restaurants_data:
+                    # The same place often matches several cuisine searches
+                    place_id = data.get("place_id")
+                    if place_id:
+                        if place_id in seen_place_ids:
+                            continue
+                        seen_place_ids.add(place_id)
+                    
                     restaurant = self._convert_google_data_to_restaurant(data)
                     if restaurant:
                         all_restaurants.append(restaurant)
@@ -583,154 +696,190 @@ class RestaurantManager:
     
     def _combine_and_filter_restaurants(
         self,
-        notion_restaurants: List[Restaurant],
-        google_restaurants: List[Restaurant],
+        notion_columns: RestaurantColumns,
+        google_columns: RestaurantColumns,
         user_profile: UserProfile,
         context: RecommendationContext
-    ) -> List[Restaurant]:
-        """Combine and filter restaurants based on context."""
-        all_restaurants = notion_restaurants + google_restaurants
+    ) -> Tuple[RestaurantColumns, List[Optional[float]]]:
+        """Combine and filter restaurants based on context.
+        
+        Returns the surviving restaurants and their distances (km) from the
+        context location, so later stages don't recompute them.
+        """
+        combined = RestaurantColumns.concat(notion_columns, google_columns)
         
         # Remove duplicates based on name and location
-        unique_restaurants = []
+        unique = []
         seen = set()
         
-        for restaurant in all_restaurants:
-            key = (restaurant.name.lower(), restaurant.location.city.lower())
+        for i, key in enumerate(combined.keys):
             if key not in seen:
                 seen.add(key)
-                unique_restaurants.append(restaurant)
+                unique.append(i)
+        
+        combined = combined.select(unique)
+        
+        # Preferences as bitmasks: "any overlap" becomes a single AND
+        cuisine_filter = cuisine_mask(context.cuisine_preferences)
+        vibe_filter = vibe_mask(context.vibe_preferences)
+        
+        # Distances are only computed for rows that reach the distance check.
+        # A great-circle distance is never less than R * |dlat|, so rows too far
+        # away in latitude alone are dropped without the full haversine (with
+        # a hair of slack so rounding can't drop a borderline row).
+        origin = radian_coordinates(context.location.latitude, context.location.longitude)
+        max_distance_km = context.max_distance_km
+        max_dlat = max_distance_km / _EARTH_RADIUS_KM * (1 + 1e-9)
         
         # Filter based on context
-        filtered_restaurants = []
+        keep = []
+        filtered_distances = []
         
-        for restaurant in unique_restaurants:
+        for i, point in enumerate(combined.coordinates):
             # Skip if exclude_visited is True and restaurant has been visited
-            if context.exclude_visited and restaurant.personal_rating is not None:
+            if context.exclude_visited and combined.visited[i]:
                 continue
             
             # Include wishlist items if specified
-            if context.include_wishlist and restaurant.is_wishlist:
-                filtered_restaurants.append(restaurant)
+            if context.include_wishlist and combined.wishlist[i]:
+                keep.append(i)
+                filtered_distances.append(_haversine_km(point, origin))
                 continue
             
             # Filter by cuisine preferences
-            if context.cuisine_preferences:
-                if not any(cuisine in restaurant.cuisine_types for cuisine in context.cuisine_preferences):
-                    continue
+            if cuisine_filter and not combined.cuisine_masks[i] & cuisine_filter:
+                continue
             
             # Filter by price range
-            if context.price_range and restaurant.price_range:
-                if restaurant.price_range != context.price_range:
+            price_range = combined.price_ranges[i]
+            if context.price_range and price_range:
+                if price_range != context.price_range:
                     continue
             
             # Filter by vibe preferences
-            if context.vibe_preferences:
-                if not any(vibe in restaurant.vibes for vibe in context.vibe_preferences):
-                    continue
+            if vibe_filter and not combined.vibe_masks[i] & vibe_filter:
+                continue
             
             # Filter by distance
-            distance = self._calculate_distance(restaurant.location, context.location)
-            if distance and distance > context.max_distance_km:
+            if point and origin and abs(point[0] - origin[0]) > max_dlat:
+                continue
+            distance = _haversine_km(point, origin)
+            if distance and distance > max_distance_km:
                 continue
             
-            filtered_restaurants.append(restaurant)
+            keep.append(i)
+            filtered_distances.append(distance)
         
-        return filtered_restaurants
+        return combined.select(keep), filtered_distances
     
-    async def _calculate_recommendation_score(
+    def _score_restaurants(
         self,
-        restaurant: Restaurant,
+        candidates: RestaurantColumns,
         user_profile: UserProfile,
-        context: RecommendationContext
-    ) -> float:
-        """Calculate recommendation score for a restaurant."""
-        score = 0.0
+        context: RecommendationContext,
+        distances: List[Optional[float]]
+    ) -> List[float]:
+        """Calculate recommendation scores for a batch of restaurants.
+        
+        ``distances`` are the restaurants' distances from the context location.
+        Everything that only depends on the user and the request is worked out
+        once up front, so the per-restaurant loop is plain lookups and arithmetic.
+        Preference matches are counted as set bits in the AND of two bitmasks,
+        or by scanning the lists for the rare restaurant whose lists repeat a
+        value (each repeat counts) or hold one the masks don't know.
+        """
+        preferences = user_profile.preferences
+        favorite_cuisines = cuisine_mask(preferences.favorite_cuisines)
+        preferred_vibes = vibe_mask(preferences.preferred_vibes)
+        preferred_price_range = preferences.preferred_price_range
+        occasion_vibes = _OCCASION_VIBE_MASKS.get(context.occasion, 0)
+        max_distance_km = context.max_distance_km
+        favorite_cuisine_set = set(preferences.favorite_cuisines)
+        preferred_vibe_set = set(preferences.preferred_vibes)
+        occasion_vibe_set = set(_OCCASION_VIBES.get(context.occasion, ()))
         
         # Base score
         base_score = 0.5
         
-        # Cuisine preference match
-        cuisine_score = 0.0
-        if restaurant.cuisine_types:
-            for cuisine in restaurant.cuisine_types:
-                if cuisine in user_profile.preferences.favorite_cuisines:
-                    cuisine_score += 0.3
-            cuisine_score = min(cuisine_score, 0.6)  # Cap at 0.6
-        
-        # Price range match
-        price_score = 0.0
-        if (restaurant.price_range and 
-            restaurant.price_range == user_profile.preferences.preferred_price_range):
-            price_score = 0.2
-        
-        # Vibe match
-        vibe_score = 0.0
-        if restaurant.vibes:
-            for vibe in restaurant.vibes:
-                if vibe in user_profile.preferences.preferred_vibes:
-                    vibe_score += 0.1
-            vibe_score = min(vibe_score, 0.3)  # Cap at 0.3
-        
-        # Distance penalty
-        distance_score = 0.0
-        distance = self._calculate_distance(restaurant.location, context.location)
-        if distance:
-            # Closer restaurants get higher scores
-            distance_score = max(0, 0.2 - (distance / context.max_distance_km) * 0.2)
-        
-        # Google rating bonus
-        google_rating_score = 0.0
-        if restaurant.google_places_data and restaurant.google_places_data.rating:
-            # Higher rated restaurants get bonus
-            google_rating_score = min(0.2, (restaurant.google_places_data.rating - 3.0) / 2.0 * 0.2)
-        
-        # Occasion match
-        occasion_score = 0.0
-        if context.occasion:
-            occasion_score = self._calculate_occasion_match(restaurant, context.occasion)
-        
-        # Combine scores
-        score = base_score + cuisine_score + price_score + vibe_score + distance_score + google_rating_score + occasion_score
-        
-        return min(score, 1.0)  # Cap at 1.0
-    
-    def _calculate_occasion_match(self, restaurant: Restaurant, occasion: OccasionType) -> float:
-        """Calculate how well a restaurant matches the occasion."""
-        occasion_vibe_mapping = {
-            OccasionType.DATE_NIGHT: [VibeType.ROMANTIC, VibeType.FINE_DINING],
-            OccasionType.BUSINESS_LUNCH: [VibeType.BUSINESS, VibeType.QUIET],
-            OccasionType.FAMILY_DINNER: [VibeType.FAMILY_FRIENDLY, VibeType.CASUAL],
-            OccasionType.CELEBRATION: [VibeType.FINE_DINING, VibeType.TRENDY],
-            OccasionType.QUICK_BITE: [VibeType.CASUAL, VibeType.FAST_FOOD],
-            OccasionType.WEEKEND_BRUNCH: [VibeType.BRUNCH, VibeType.CASUAL],
-            OccasionType.HAPPY_HOUR: [VibeType.SPORTS_BAR, VibeType.LIVELY],
-            OccasionType.LATE_NIGHT: [VibeType.LATE_NIGHT, VibeType.CASUAL]
-        }
-        
-        preferred_vibes = occasion_vibe_mapping.get(occasion, [])
-        
-        match_score = 0.0
-        for vibe in restaurant.vibes:
-            if vibe in preferred_vibes:
-                match_score += 0.1
+        scores = []
+        for restaurant, exact, cuisines, vibes, price_range, google_rating, distance in zip(
+            candidates.restaurants, candidates.exact_masks, candidates.cuisine_masks,
+            candidates.vibe_masks, candidates.price_ranges, candidates.google_ratings, distances
+        ):
+            if exact:
+                cuisine_matches = popcount(cuisines & favorite_cuisines)
+                vibe_matches = popcount(vibes & preferred_vibes)
+                occasion_matches = popcount(vibes & occasion_vibes)
+            else:
+                cuisine_matches = sum(c in favorite_cuisine_set for c in restaurant.cuisine_types)
+                vibe_matches = sum(v in preferred_vibe_set for v in restaurant.vibes)
+                occasion_matches = sum(v in occasion_vibe_set for v in restaurant.vibes)
+            
+            # Cuisine preference match (capped at 0.6)
+            cuisine_score = 0.0
+            if cuisine_matches:
+                cuisine_score = min(cuisine_matches * 0.3, 0.6)
+            
+            # Price range match
+            price_score = 0.0
+            if price_range and price_range == preferred_price_range:
+                price_score = 0.2
+            
+            # Vibe match (capped at 0.3)
+            vibe_score = 0.0
+            if vibe_matches:
+                vibe_score = min(vibe_matches * 0.1, 0.3)
+            
+            # Distance penalty: closer restaurants get higher scores
+            distance_score = 0.0
+            if distance:
+                distance_score = max(0, 0.2 - (distance / max_distance_km) * 0.2)
+            
+            # Google rating bonus
+            google_rating_score = 0.0
+            if google_rating:
+                google_rating_score = min(0.2, (google_rating - 3.0) / 2.0 * 0.2)
+            
+            # Occasion match (capped at 0.2)
+            occasion_score = 0.0
+            if occasion_matches:
+                occasion_score = min(occasion_matches * 0.1, 0.2)
+            
+            # Combine scores
+            score = base_score + cuisine_score + price_score + vibe_score + distance_score + google_rating_score + occasion_score
+            scores.append(min(score, 1.0))  # Cap at 1.0
         
-        return min(match_score, 0.2)  # Cap at 0.2
+        return scores
+    
+    def _preference_sets(
+        self,
+        user_profile: UserProfile
+    ) -> Tuple[FrozenSet[CuisineType], FrozenSet[VibeType]]:
+        """Get the user's favorite cuisines and preferred vibes as sets."""
+        preferences = user_profile.preferences
+        return frozenset(preferences.favorite_cuisines), frozenset(preferences.preferred_vibes)
     
     def _generate_reasoning(
         self,
         restaurant: Restaurant,
         user_profile: UserProfile,
         context: RecommendationContext,
-        score: float
+        score: float,
+        distance: Optional[float],
+        preference_sets: Optional[Tuple[FrozenSet[CuisineType], FrozenSet[VibeType]]] = None
     ) -> str:
-        """Generate reasoning for recommendation."""
+        """Generate reasoning for recommendation.
+        
+        Pass ``preference_sets`` from ``_preference_sets`` when explaining a
+        batch, so the user's favorites are hashed once rather than per call.
+        """
+        favorite_cuisines, preferred_vibes = preference_sets or self._preference_sets(user_profile)
         reasons = []
         
         # Cuisine match
-        cuisine_matches = [c for c in restaurant.cuisine_types if c in user_profile.preferences.favorite_cuisines]
+        cuisine_matches = [c for c in restaurant.cuisine_types if c in favorite_cuisines]
         if cuisine_matches:
-            reasons.append(f"Matches your favorite cuisines: {', '.join(c.value for c in cuisine_matches)}")
+            reasons.append(f"Matches your favorite cuisines: {', '.join(map(CUISINE_LABELS.__getitem__, cuisine_matches))}")
         
         # Price match
         if (restaurant.price_range and 
@@ -738,9 +887,9 @@ class RestaurantManager:
             reasons.append(f"Fits your preferred price range ({restaurant.price_range.value})")
         
         # Vibe match
-        vibe_matches = [v for v in restaurant.vibes if v in user_profile.preferences.preferred_vibes]
+        vibe_matches = [v for v in restaurant.vibes if v in preferred_vibes]
         if vibe_matches:
-            reasons.append(f"Matches your preferred vibes: {', '.join(v.value for v in vibe_matches)}")
+            reasons.append(f"Matches your preferred vibes: {', '.join(map(VIBE_LABELS.__getitem__, vibe_matches))}")
         
         # Google rating
         if restaurant.google_places_data and restaurant.google_places_data.rating:
@@ -748,7 +897,6 @@ class RestaurantManager:
                 reasons.append(f"Highly rated on Google ({restaurant.google_places_data.rating}/5)")
         
         # Distance
-        distance = self._calculate_distance(restaurant.location, context.location)
         if distance and distance <= 5:
             reasons.append(f"Conveniently located ({distance:.1f}km away)")
         
@@ -761,60 +909,115 @@ class RestaurantManager:
         
         return "; ".join(reasons)
     
-    def _calculate_distance(self, location1: Location, location2: Location) -> Optional[float]:
-        """Calculate distance between two locations in kilometers."""
-        if not all([location1.latitude, location1.longitude, location2.latitude, location2.longitude]):
-            return None
-        
-        # Haversine formula
-        R = 6371  # Earth's radius in km
-        
-        lat1, lon1 = math.radians(location1.latitude), math.radians(location1.longitude)
-        lat2, lon2 = math.radians(location2.latitude), math.radians(location2.longitude)
-        
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
-        
-        a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
-        c = 2 * math.asin(math.sqrt(a))
-        
-        return R * c
-    
-    def _calculate_similarity(self, restaurant1: Restaurant, restaurant2: Restaurant) -> float:
-        """Calculate similarity between two restaurants."""
-        similarity = 0.0
-        
-        # Cuisine similarity
-        common_cuisines = set(restaurant1.cuisine_types) & set(restaurant2.cuisine_types)
-        if common_cuisines:
-            similarity += 0.4
+    def _similarities_to(
+        self,
+        reference: Restaurant,
+        columns: RestaurantColumns
+    ) -> List[float]:
+        """Calculate the similarity of every restaurant in ``columns`` to ``reference``."""
+        reference_cuisines = cuisine_mask(reference.cuisine_types)
+        reference_vibes = vibe_mask(reference.vibes)
+        reference_price = reference.price_range
+        # Values the masks don't know can only be compared as sets
+        reference_exact = (
+            popcount(reference_cuisines) == len(set(reference.cuisine_types))
+            and popcount(reference_vibes) == len(set(reference.vibes))
+        )
         
-        # Price similarity
-        if restaurant1.price_range and restaurant2.price_range:
-            if restaurant1.price_range == restaurant2.price_range:
+        similarities = []
+        for restaurant, exact, cuisines, vibes, price_range in zip(
+            columns.restaurants, columns.exact_masks, columns.cuisine_masks,
+            columns.vibe_masks, columns.price_ranges
+        ):
+            if exact and reference_exact:
+                shared_cuisines = cuisines & reference_cuisines
+                shared_vibes = vibes & reference_vibes
+            else:
+                shared_cuisines = set(restaurant.cuisine_types) & set(reference.cuisine_types)
+                shared_vibes = set(restaurant.vibes) & set(reference.vibes)
+            
+            similarity = 0.0
+            
+            # Cuisine similarity
+            if shared_cuisines:
+                similarity += 0.4
+            
+            # Price similarity
+            if reference_price and price_range == reference_price:
                 similarity += 0.3
+            
+            # Vibe similarity
+            if shared_vibes:
+                similarity += 0.3
+            
+            similarities.append(similarity)
         
-        # Vibe similarity
-        common_vibes = set(restaurant1.vibes) & set(restaurant2.vibes)
-        if common_vibes:
-            similarity += 0.3
-        
-        return similarity
+        return similarities
     
-    def _analyze_cuisine_preferences(self, restaurants: List[Restaurant]) -> List[Dict[str, Any]]:
-        """Analyze cuisine preferences from restaurants."""
+    def _collect_dining_stats(self, restaurants: List[Restaurant]) -> Dict[str, Any]:
+        """Gather everything the profile and dining-pattern analysis need in one pass."""
+        recent_cutoff = datetime.now() - timedelta(days=30)
+        
+        all_cuisine_counter = Counter()
         cuisine_counter = Counter()
-        cuisine_ratings = defaultdict(list)
+        cuisine_rating_totals: Dict[CuisineType, float] = {}
+        price_counter = Counter()
+        vibe_counter = Counter()
+        location_counter = Counter()
+        location_key_counter = Counter()
+        location_map = {}
+        recent_visits = 0
+        recent_cuisines = Counter()
+        recent_ratings = []
         
+        # Counter.update(iterable) counts in C; only the rating totals need a Python loop
         for restaurant in restaurants:
-            if restaurant.personal_rating:
-                for cuisine in restaurant.cuisine_types:
-                    cuisine_counter[cuisine] += 1
-                    cuisine_ratings[cuisine].append(restaurant.personal_rating)
+            rating = restaurant.personal_rating
+            cuisine_types = restaurant.cuisine_types
+            all_cuisine_counter.update(cuisine_types)
+            if rating:
+                cuisine_counter.update(cuisine_types)
+                for cuisine in cuisine_types:
+                    cuisine_rating_totals[cuisine] = cuisine_rating_totals.get(cuisine, 0) + rating
+            
+            if restaurant.price_range:
+                price_counter[restaurant.price_range] += 1
+            
+            vibe_counter.update(restaurant.vibes)
+            
+            location = restaurant.location
+            location_counter[location.city] += 1
+            location_key = (location.city, location.state)
+            location_key_counter[location_key] += 1
+            location_map[location_key] = location  # last one seen wins
+            
+            if restaurant.date_visited and restaurant.date_visited > recent_cutoff:
+                recent_visits += 1
+                recent_cuisines.update(cuisine_types)
+                if rating:
+                    recent_ratings.append(rating)
+        
+        return {
+            "all_cuisine_counter": all_cuisine_counter,
+            "cuisine_counter": cuisine_counter,
+            "cuisine_rating_totals": cuisine_rating_totals,
+            "price_counter": price_counter,
+            "vibe_counter": vibe_counter,
+            "location_counter": location_counter,
+            "location_key_counter": location_key_counter,
+            "location_map": location_map,
+            "recent_visits": recent_visits,
+            "recent_cuisines": recent_cuisines,
+            "recent_ratings": recent_ratings,
+        }
+    
+    def _analyze_cuisine_preferences(self, stats: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Analyze cuisine preferences from restaurants."""
+        rating_totals = stats["cuisine_rating_totals"]
         
         cuisine_analysis = []
-        for cuisine, count in cuisine_counter.most_common():
-            avg_rating = sum(cuisine_ratings[cuisine]) / len(cuisine_ratings[cuisine])
+        for cuisine, count in stats["cuisine_counter"].most_common():
+            avg_rating = rating_totals[cuisine] / count
             cuisine_analysis.append({
                 "name": cuisine.value,
                 "count": count,
@@ -823,71 +1026,44 @@ class RestaurantManager:
         
         return cuisine_analysis
     
-    def _analyze_price_preferences(self, restaurants: List[Restaurant]) -> str:
+    def _analyze_price_preferences(self, stats: Dict[str, Any]) -> str:
         """Analyze price preferences."""
-        price_counter = Counter()
-        for restaurant in restaurants:
-            if restaurant.price_range:
-                price_counter[restaurant.price_range] += 1
-        
+        price_counter = stats["price_counter"]
         if price_counter:
             most_common_price = price_counter.most_common(1)[0][0]
             return most_common_price.value
         
         return "Unknown"
     
-    def _analyze_vibe_preferences(self, restaurants: List[Restaurant]) -> List[Dict[str, Any]]:
+    def _analyze_vibe_preferences(self, stats: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Analyze vibe preferences."""
-        vibe_counter = Counter()
-        for restaurant in restaurants:
-            for vibe in restaurant.vibes:
-                vibe_counter[vibe] += 1
-        
-        vibe_analysis = []
-        for vibe, count in vibe_counter.most_common(5):
-            vibe_analysis.append({
-                "name": vibe.value,
-                "count": count
-            })
-        
-        return vibe_analysis
+        return [
+            {"name": vibe.value, "count": count}
+            for vibe, count in stats["vibe_counter"].most_common(5)
+        ]
     
-    def _analyze_location_patterns(self, restaurants: List[Restaurant]) -> List[Dict[str, Any]]:
+    def _analyze_location_patterns(self, stats: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Analyze location patterns."""
-        location_counter = Counter()
-        for restaurant in restaurants:
-            location_counter[restaurant.location.city] += 1
-        
-        location_analysis = []
-        for city, count in location_counter.most_common(5):
-            location_analysis.append({
-                "city": city,
-                "count": count
-            })
-        
-        return location_analysis
+        return [
+            {"city": city, "count": count}
+            for city, count in stats["location_counter"].most_common(5)
+        ]
     
-    def _analyze_recent_trends(self, restaurants: List[Restaurant]) -> List[str]:
+    def _analyze_recent_trends(self, stats: Dict[str, Any]) -> List[str]:
         """Analyze recent dining trends."""
-        recent_restaurants = [r for r in restaurants if r.date_visited and r.date_visited > datetime.now() - timedelta(days=30)]
-        
-        if not recent_restaurants:
+        if not stats["recent_visits"]:
             return ["No recent dining activity"]
         
         trends = []
         
         # Recent cuisine trends
-        recent_cuisines = Counter()
-        for restaurant in recent_restaurants:
-            for cuisine in restaurant.cuisine_types:
-                recent_cuisines[cuisine] += 1
-        
+        recent_cuisines = stats["recent_cuisines"]
         if recent_cuisines:
             top_cuisine = recent_cuisines.most_common(1)[0][0]
             trends.append(f"Recently favoring {top_cuisine.value} cuisine")
         
         # Recent rating trends
-        recent_ratings = [r.personal_rating for r in recent_restaurants if r.personal_rating]
+        recent_ratings = stats["recent_ratings"]
         if recent_ratings:
             avg_recent_rating = sum(recent_ratings) / len(recent_ratings)
             trends.append(f"Recent average rating: {avg_recent_rating:.1f}")
@@ -909,43 +1085,24 @@ class RestaurantManager:
         
         return insights
     
-    def _get_most_common_cuisine(self, restaurants: List[Restaurant]) -> Optional[CuisineType]:
+    def _get_most_common_cuisine(self, stats: Dict[str, Any]) -> Optional[CuisineType]:
         """Get most common cuisine type."""
-        cuisine_counter = Counter()
-        for restaurant in restaurants:
-            for cuisine in restaurant.cuisine_types:
-                cuisine_counter[cuisine] += 1
-        
+        cuisine_counter = stats["all_cuisine_counter"]
         if cuisine_counter:
             return cuisine_counter.most_common(1)[0][0]
         return None
     
-    def _get_most_common_price_range(self, restaurants: List[Restaurant]) -> Optional[PriceRange]:
+    def _get_most_common_price_range(self, stats: Dict[str, Any]) -> Optional[PriceRange]:
         """Get most common price range."""
-        price_counter = Counter()
-        for restaurant in restaurants:
-            if restaurant.price_range:
-                price_counter[restaurant.price_range] += 1
-        
+        price_counter = stats["price_counter"]
         if price_counter:
             return price_counter.most_common(1)[0][0]
         return None
     
-    def _get_frequent_locations(self, restaurants: List[Restaurant]) -> List[Location]:
+    def _get_frequent_locations(self, stats: Dict[str, Any]) -> List[Location]:
         """Get frequent dining locations."""
-        location_counter = Counter()
-        location_map = {}
-        
-        for restaurant in restaurants:
-            key = (restaurant.location.city, restaurant.location.state)
-            location_counter[key] += 1
-            location_map[key] = restaurant.location
-        
-        frequent_locations = []
-        for (city, state), count in location_counter.most_common(3):
-            frequent_locations.append(location_map[(city, state)])
-        
-        return frequent_locations
+        location_map = stats["location_map"]
+        return [location_map[key] for key, _ in stats["location_key_counter"].most_common(3)]
     
     def _update_preferences_from_feedback(
         self,
@@ -953,22 +1110,31 @@ class RestaurantManager:
         feedback: SessionFeedback
     ) -> UserPreferences:
         """Update preferences based on user feedback."""
+        # dict.fromkeys acts as an insertion-ordered set: O(1) add/discard
+        # while the stored lists keep their order
+        favorite_cuisines = dict.fromkeys(preferences.favorite_cuisines)
+        preferred_vibes = dict.fromkeys(preferences.preferred_vibes)
+        
         # Update cuisine preferences
         for cuisine, rating in feedback.cuisine_feedback.items():
-            if rating >= 4.0 and cuisine not in preferences.favorite_cuisines:
-                preferences.favorite_cuisines.append(cuisine)
-            elif rating < 2.0 and cuisine in preferences.favorite_cuisines:
-                preferences.favorite_cuisines.remove(cuisine)
+            if rating >= 4.0:
+                favorite_cuisines.setdefault(cuisine)
+            elif rating < 2.0:
+                favorite_cuisines.pop(cuisine, None)
         
         # Update vibe preferences
         for vibe, rating in feedback.vibe_feedback.items():
-            if rating >= 4.0 and vibe not in preferences.preferred_vibes:
-                preferences.preferred_vibes.append(vibe)
-            elif rating < 2.0 and vibe in preferences.preferred_vibes:
-                preferences.preferred_vibes.remove(vibe)
+            if rating >= 4.0:
+                preferred_vibes.setdefault(vibe)
+            elif rating < 2.0:
+                preferred_vibes.pop(vibe, None)
         
-        # Update price preferences
-        for price_range, rating in feedback.price_feedback.items():
+        preferences.favorite_cuisines = list(favorite_cuisines)
+        preferences.preferred_vibes = list(preferred_vibes)
+        
+        # Update price preferences: the best-rated range wins, not the last one listed
+        if feedback.price_feedback:
+            price_range, rating = max(feedback.price_feedback.items(), key=itemgetter(1))
             if rating >= 4.0:
                 preferences.preferred_price_range = price_range
         
@@ -979,13 +1145,23 @@ class RestaurantManager:
         context: RecommendationContext,
         learned_preferences: UserPreferences
     ) -> RecommendationContext:
-        """Apply learned preferences to recommendation context."""
-        # Merge with existing preferences
+        """Apply learned preferences to recommendation context.
+        
+        Returns a new context; the session's own context is left untouched so
+        repeated refinements don't keep appending the same preferences.
+        """
+        context = context.model_copy()
+        
+        # Merge with existing preferences, without duplicates
         if learned_preferences.favorite_cuisines:
-            context.cuisine_preferences.extend(learned_preferences.favorite_cuisines)
+            context.cuisine_preferences = list(dict.fromkeys(
+                context.cuisine_preferences + learned_preferences.favorite_cuisines
+            ))
         
         if learned_preferences.preferred_vibes:
-            context.vibe_preferences.extend(learned_preferences.preferred_vibes)
+            context.vibe_preferences = list(dict.fromkeys(
+                context.vibe_preferences + learned_preferences.preferred_vibes
+            ))
         
         if learned_preferences.preferred_price_range:
             context.price_range = learned_preferences.preferred_price_range
@@ -2,8 +2,9 @@
 
 import asyncio
 import logging
-from typing import Dict, List, Optional, Any
-from datetime import datetime
+from functools import lru_cache
+from typing import Any, Awaitable, Dict, List, Optional, Tuple
+from datetime import datetime, timedelta
 import json
 import uuid
 import sys
@@ -14,26 +15,89 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from mcp.server.fastmcp import FastMCP
 
-from src.config import settings, validate_configuration
+from src.config import validate_configuration
 from src.models import (
-    Restaurant, Location, RecommendationContext, CuisineType, 
-    PriceRange, VibeType, OccasionType, SessionFeedback
+    Restaurant, Location, RecommendationContext, OccasionType, SessionFeedback,
+    CUISINE_BY_NAME, OCCASION_BY_NAME, PRICE_RANGE_BY_NAME, VIBE_BY_NAME
 )
 from src.notion_manager import NotionManager
-from src.maps_client import GoogleMapsClient
+from src.maps_client import get_maps_client
 from src.restaurant_manager import RestaurantManager
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+try:
+    import orjson
+except ImportError:  # optional speedup, see the "speedups" extra
+    orjson = None
+
+def _dumps(obj: Any) -> str:
+    """Serialize a response payload as indented JSON."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2)
+
+# Longest a new visit waits for Google Maps data before it is saved without it
+_ENRICH_TIMEOUT_SECONDS = 2.0
+
+# Longest test_connections waits for either API before reporting it as down
+_CONNECTION_CHECK_TIMEOUT_SECONDS = 5.0
+
+# Restaurant fields exposed by the database resource, serialized by pydantic
+_DATABASE_FIELDS = {
+    "id": True,
+    "name": True,
+    "location": {"city", "state", "address"},
+    "cuisine_types": True,
+    "price_range": True,
+    "vibes": True,
+    "personal_rating": True,
+    "date_visited": True,
+    "is_wishlist": True,
+    "notes": True,
+}
+
+def _parse_csv(value: Optional[str], lookup: Dict[str, Any], kind: str) -> List[Any]:
+    """Map a comma-separated tool argument through ``lookup``, skipping unknown names.
+    
+    ``lookup`` is keyed by lower-cased names, so matching ignores case.
+    """
+    members = []
+    if value:
+        for name in value.split(","):
+            name = name.strip()
+            member = lookup.get(name.lower())
+            if member is None:
+                logger.warning("Invalid %s: %s", kind, name)
+            else:
+                members.append(member)
+    return members
+
+# Per-restaurant fields of the list tools; each tool picks its own, in order
+def _summarize(restaurants: List[Restaurant], fields: Tuple[str, ...]) -> List[Dict[str, Any]]:
+    """Build the response rows for ``restaurants`` from the named summary fields."""
+    # Restaurant.summary is formatted once per cached restaurant, not per call
+    return [
+        {field: summary[field] for field in fields}
+        for summary in (restaurant.summary for restaurant in restaurants)
+    ]
+
 # Initialize MCP server
 mcp = FastMCP("Restaurant Recommendation Server")
 
-# Initialize components
-notion_client = NotionManager()
-maps_client = GoogleMapsClient()
-restaurant_manager = RestaurantManager(notion_client, maps_client)
+# Components are created on first use, so importing this module (or reading
+# config://status) does not set up the Notion and Google Maps SDK clients
+@lru_cache(maxsize=None)
+def _notion_client() -> NotionManager:
+    """Get the shared Notion client."""
+    return NotionManager()
+
+@lru_cache(maxsize=None)
+def _restaurant_manager() -> RestaurantManager:
+    """Get the shared restaurant manager."""
+    return RestaurantManager(_notion_client(), get_maps_client())
 
 # Server startup and status
 @mcp.resource("config://status")
@@ -49,13 +113,13 @@ def get_server_status() -> str:
         "configuration": config_status
     }
     
-    return json.dumps(status_info, indent=2)
+    return _dumps(status_info)
 
 @mcp.resource("profile://dining-preferences/{user_id}")
 async def get_dining_profile(user_id: str = "default") -> str:
     """Get comprehensive dining profile for a user."""
     try:
-        profile = await restaurant_manager.generate_dining_profile(user_id)
+        profile = await _restaurant_manager().generate_dining_profile(user_id)
         return profile
     except Exception as e:
         logger.error(f"Failed to get dining profile: {e}")
@@ -65,24 +129,16 @@ async def get_dining_profile(user_id: str = "default") -> str:
 async def get_recent_visits(user_id: str = "default", limit: int = 10) -> str:
     """Get recent restaurant visits."""
     try:
-        restaurants = await notion_client.get_recent_visits(limit)
+        restaurants = await _notion_client().get_recent_visits(limit)
         
         if not restaurants:
             return "No recent visits found."
         
-        visits_info = []
-        for restaurant in restaurants:
-            visit_info = {
-                "name": restaurant.name,
-                "location": f"{restaurant.location.city}, {restaurant.location.state}",
-                "rating": restaurant.personal_rating,
-                "date_visited": restaurant.date_visited.isoformat() if restaurant.date_visited else None,
-                "cuisine_types": [c.value for c in restaurant.cuisine_types],
-                "notes": restaurant.notes
-            }
-            visits_info.append(visit_info)
+        visits_info = _summarize(restaurants, (
+            "name", "location", "rating", "date_visited", "cuisine_types", "notes"
+        ))
         
-        return json.dumps(visits_info, indent=2)
+        return _dumps(visits_info)
     except Exception as e:
         logger.error(f"Failed to get recent visits: {e}")
         return f"Error retrieving recent visits: {str(e)}"
@@ -91,7 +147,7 @@ async def get_recent_visits(user_id: str = "default", limit: int = 10) -> str:
 async def get_favorite_restaurants(user_id: str = "default", min_rating: float = 4.0) -> str:
     """Get favorite restaurants (highly rated)."""
     try:
-        restaurants = await notion_client.get_favorites(min_rating)
+        restaurants = await _notion_client().get_favorites(min_rating)
         
         if not restaurants:
             return f"No restaurants with rating >= {min_rating} found."
@@ -100,15 +156,15 @@ async def get_favorite_restaurants(user_id: str = "default", min_rating: float =
         for restaurant in restaurants:
             favorite_info = {
                 "name": restaurant.name,
-                "location": f"{restaurant.location.city}, {restaurant.location.state}",
+                "location": restaurant.location.display,
                 "rating": restaurant.personal_rating,
-                "cuisine_types": [c.value for c in restaurant.cuisine_types],
-                "vibes": [v.value for v in restaurant.vibes],
+                "cuisine_types": restaurant.cuisine_values,
+                "vibes": restaurant.vibe_values,
                 "notes": restaurant.notes
             }
             favorites_info.append(favorite_info)
         
-        return json.dumps(favorites_info, indent=2)
+        return _dumps(favorites_info)
     except Exception as e:
         logger.error(f"Failed to get favorites: {e}")
         return f"Error retrieving favorites: {str(e)}"
@@ -117,7 +173,7 @@ async def get_favorite_restaurants(user_id: str = "default", min_rating: float =
 async def get_wishlist_restaurants(user_id: str = "default") -> str:
     """Get wishlist restaurants."""
     try:
-        restaurants = await notion_client.get_wishlist()
+        restaurants = await _notion_client().get_wishlist()
         
         if not restaurants:
             return "No wishlist restaurants found."
@@ -126,15 +182,15 @@ async def get_wishlist_restaurants(user_id: str = "default") -> str:
         for restaurant in restaurants:
             wishlist_item = {
                 "name": restaurant.name,
-                "location": f"{restaurant.location.city}, {restaurant.location.state}",
-                "cuisine_types": [c.value for c in restaurant.cuisine_types],
-                "vibes": [v.value for v in restaurant.vibes],
+                "location": restaurant.location.display,
+                "cuisine_types": restaurant.cuisine_values,
+                "vibes": restaurant.vibe_values,
                 "notes": restaurant.notes,
                 "google_rating": restaurant.google_places_data.rating if restaurant.google_places_data else None
             }
             wishlist_info.append(wishlist_item)
         
-        return json.dumps(wishlist_info, indent=2)
+        return _dumps(wishlist_info)
     except Exception as e:
         logger.error(f"Failed to get wishlist: {e}")
         return f"Error retrieving wishlist: {str(e)}"
@@ -143,38 +199,52 @@ async def get_wishlist_restaurants(user_id: str = "default") -> str:
 async def get_restaurant_database(user_id: str = "default") -> str:
     """Get complete restaurant database."""
     try:
-        restaurants = await notion_client.get_all_restaurants()
+        restaurants = await _notion_client().get_all_restaurants()
         
         database_info = {
             "total_restaurants": len(restaurants),
             "last_updated": datetime.now().isoformat(),
-            "restaurants": []
+            "restaurants": [
+                restaurant.model_dump(mode="json", include=_DATABASE_FIELDS)
+                for restaurant in restaurants
+            ]
         }
         
-        for restaurant in restaurants:
-            restaurant_info = {
-                "id": restaurant.id,
-                "name": restaurant.name,
-                "location": {
-                    "city": restaurant.location.city,
-                    "state": restaurant.location.state,
-                    "address": restaurant.location.address
-                },
-                "cuisine_types": [c.value for c in restaurant.cuisine_types],
-                "price_range": restaurant.price_range.value if restaurant.price_range else None,
-                "vibes": [v.value for v in restaurant.vibes],
-                "personal_rating": restaurant.personal_rating,
-                "date_visited": restaurant.date_visited.isoformat() if restaurant.date_visited else None,
-                "is_wishlist": restaurant.is_wishlist,
-                "notes": restaurant.notes
-            }
-            database_info["restaurants"].append(restaurant_info)
-        
-        return json.dumps(database_info, indent=2)
+        return _dumps(database_info)
     except Exception as e:
         logger.error(f"Failed to get restaurant database: {e}")
         return f"Error retrieving restaurant database: {str(e)}"
 
+@mcp.tool()
+async def get_restaurant_database_page(
+    user_id: str = "default",
+    limit: int = 50,
+    cursor: str = None
+) -> str:
+    """Get one page of your restaurant database.
+    
+    Args:
+        user_id: User identifier
+        limit: Maximum number of restaurants to return (at most 100)
+        cursor: next_cursor from the previous page; omit for the first page
+    """
+    try:
+        restaurants, next_cursor = await _notion_client().get_restaurants_page(limit, cursor)
+        
+        page_info = {
+            "restaurants": [
+                restaurant.model_dump(mode="json", include=_DATABASE_FIELDS)
+                for restaurant in restaurants
+            ],
+            "has_more": next_cursor is not None,
+            "next_cursor": next_cursor
+        }
+        
+        return _dumps(page_info)
+    except Exception as e:
+        logger.error(f"Failed to get restaurant database page: {e}")
+        return f"Error retrieving restaurant database page: {str(e)}"
+
 # Restaurant recommendation tools
 @mcp.tool()
 async def get_restaurant_recommendations(
@@ -219,20 +289,10 @@ async def get_restaurant_recommendations(
             return "Error: Either city or latitude/longitude must be provided"
         
         # Parse cuisine preferences
-        cuisine_list = []
-        if cuisine_preferences:
-            cuisine_names = [c.strip() for c in cuisine_preferences.split(",")]
-            for cuisine_name in cuisine_names:
-                try:
-                    cuisine_list.append(CuisineType(cuisine_name))
-                except ValueError:
-                    logger.warning(f"Invalid cuisine type: {cuisine_name}")
+        cuisine_list = _parse_csv(cuisine_preferences, CUISINE_BY_NAME, "cuisine type")
         
         # Parse occasion
-        try:
-            occasion_type = OccasionType(occasion)
-        except ValueError:
-            occasion_type = OccasionType.CASUAL_DINING
+        occasion_type = OCCASION_BY_NAME.get((occasion or "").lower(), OccasionType.CASUAL_DINING)
         
         # Build recommendation context
         context = RecommendationContext(
@@ -245,7 +305,7 @@ async def get_restaurant_recommendations(
         )
         
         # Get recommendations
-        recommendations = await restaurant_manager.get_recommendations(user_id, context)
+        recommendations = await _restaurant_manager().get_recommendations(user_id, context)
         
         if not recommendations:
             return f"No recommendations found for {location.city}. Try expanding your search radius or adjusting preferences."
@@ -253,7 +313,7 @@ async def get_restaurant_recommendations(
         # Format recommendations
         rec_info = {
             "context": {
-                "location": f"{location.city}, {location.state}",
+                "location": location.display,
                 "occasion": occasion,
                 "cuisine_preferences": cuisine_preferences,
                 "max_distance_km": max_distance_km
@@ -271,16 +331,16 @@ async def get_restaurant_recommendations(
                     "state": rec.restaurant.location.state,
                     "address": rec.restaurant.location.address
                 },
-                "cuisine_types": [c.value for c in rec.restaurant.cuisine_types],
-                "price_range": rec.restaurant.price_range.value if rec.restaurant.price_range else None,
-                "vibes": [v.value for v in rec.restaurant.vibes],
+                "cuisine_types": rec.restaurant.cuisine_values,
+                "price_range": rec.restaurant.summary["price_range"],
+                "vibes": rec.restaurant.vibe_values,
                 "distance_km": round(rec.distance_km, 1) if rec.distance_km else None,
                 "google_rating": rec.restaurant.google_places_data.rating if rec.restaurant.google_places_data else None,
                 "is_wishlist": rec.restaurant.is_wishlist
             }
             rec_info["recommendations"].append(rec_data)
         
-        return json.dumps(rec_info, indent=2)
+        return _dumps(rec_info)
     except Exception as e:
         logger.error(f"Failed to get recommendations: {e}")
         return f"Error getting recommendations: {str(e)}"
@@ -323,32 +383,17 @@ async def add_restaurant_visit(
         location = Location(city=city, state=state)
         
         # Parse cuisine types
-        cuisine_list = []
-        if cuisine_types:
-            cuisine_names = [c.strip() for c in cuisine_types.split(",")]
-            for cuisine_name in cuisine_names:
-                try:
-                    cuisine_list.append(CuisineType(cuisine_name))
-                except ValueError:
-                    logger.warning(f"Invalid cuisine type: {cuisine_name}")
+        cuisine_list = _parse_csv(cuisine_types, CUISINE_BY_NAME, "cuisine type")
         
         # Parse price range
         price_range_enum = None
         if price_range:
-            try:
-                price_range_enum = PriceRange(price_range)
-            except ValueError:
-                logger.warning(f"Invalid price range: {price_range}")
+            price_range_enum = PRICE_RANGE_BY_NAME.get(price_range.strip().lower())
+            if price_range_enum is None:
+                logger.warning("Invalid price range: %s", price_range)
         
         # Parse vibes
-        vibe_list = []
-        if vibes:
-            vibe_names = [v.strip() for v in vibes.split(",")]
-            for vibe_name in vibe_names:
-                try:
-                    vibe_list.append(VibeType(vibe_name))
-                except ValueError:
-                    logger.warning(f"Invalid vibe type: {vibe_name}")
+        vibe_list = _parse_csv(vibes, VIBE_BY_NAME, "vibe type")
         
         # Parse date
         visit_date = None
@@ -356,7 +401,7 @@ async def add_restaurant_visit(
             try:
                 visit_date = datetime.fromisoformat(date_visited)
             except ValueError:
-                logger.warning(f"Invalid date format: {date_visited}")
+                logger.warning("Invalid date format: %s", date_visited)
         
         # Create restaurant
         restaurant = Restaurant(
@@ -370,18 +415,23 @@ async def add_restaurant_visit(
             date_visited=visit_date or datetime.now()
         )
         
+        # Look the restaurant up on Google Maps first, so the Notion page is
+        # created with its Place ID in a single request. Enrichment works on a
+        # copy: on timeout the original is added without Google data.
+        try:
+            restaurant = await asyncio.wait_for(
+                get_maps_client().enrich_restaurant_data(restaurant.model_copy(deep=True)),
+                timeout=_ENRICH_TIMEOUT_SECONDS
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"Google Maps enrichment timed out for {restaurant_name}")
+        except Exception as e:
+            logger.warning(f"Failed to enrich restaurant data: {e}")
+        
         # Add to Notion
-        result = await notion_client.add_restaurant(restaurant)
+        result = await _notion_client().add_restaurant(restaurant)
         
         if result["success"]:
-            # Try to enrich with Google Maps data
-            try:
-                enriched_restaurant = await maps_client.enrich_restaurant_data(restaurant)
-                if enriched_restaurant.google_places_data:
-                    await notion_client.update_restaurant(result["page_id"], enriched_restaurant)
-            except Exception as e:
-                logger.warning(f"Failed to enrich restaurant data: {e}")
-            
             return f"✅ Successfully added {restaurant_name} to your restaurant database!"
         else:
             return f"❌ Failed to add restaurant: {result.get('error', 'Unknown error')}"
@@ -413,18 +463,12 @@ async def update_restaurant_rating(
             return "Error: New rating is required"
         
         # Find restaurant
-        restaurant = await notion_client.get_restaurant_by_name(restaurant_name)
-        if not restaurant:
+        page_id = await _notion_client().get_page_id_by_name(restaurant_name)
+        if not page_id:
             return f"Restaurant '{restaurant_name}' not found in your database"
         
-        # Update rating
-        restaurant.personal_rating = new_rating
-        if notes:
-            restaurant.notes = notes
-        restaurant.updated_at = datetime.now()
-        
-        # Update in Notion
-        result = await notion_client.update_restaurant(restaurant.notion_page_id, restaurant)
+        # Update in Notion; only the changed properties are sent
+        result = await _notion_client().update_rating(page_id, new_rating, notes)
         
         if result["success"]:
             return f"✅ Updated rating for {restaurant_name} to {new_rating} stars"
@@ -443,12 +487,12 @@ async def analyze_dining_patterns(user_id: str = "default") -> str:
         user_id: User identifier
     """
     try:
-        analysis = await restaurant_manager.analyze_dining_patterns(user_id)
+        analysis = await _restaurant_manager().analyze_dining_patterns(user_id)
         
         if "error" in analysis:
             return f"Error analyzing dining patterns: {analysis['error']}"
         
-        return json.dumps(analysis, indent=2)
+        return _dumps(analysis)
     
     except Exception as e:
         logger.error(f"Failed to analyze dining patterns: {e}")
@@ -471,7 +515,7 @@ async def find_similar_restaurants(
         if not restaurant_name:
             return "Error: Restaurant name is required"
         
-        similar_restaurants = await restaurant_manager.find_similar_restaurants(restaurant_name, user_id, max_results)
+        similar_restaurants = await _restaurant_manager().find_similar_restaurants(restaurant_name, user_id, max_results)
         
         if not similar_restaurants:
             return f"No similar restaurants found for '{restaurant_name}'"
@@ -486,14 +530,14 @@ async def find_similar_restaurants(
                 "name": rec.restaurant.name,
                 "similarity_score": round(rec.score, 2),
                 "reasoning": rec.reasoning,
-                "location": f"{rec.restaurant.location.city}, {rec.restaurant.location.state}",
-                "cuisine_types": [c.value for c in rec.restaurant.cuisine_types],
-                "vibes": [v.value for v in rec.restaurant.vibes],
+                "location": rec.restaurant.location.display,
+                "cuisine_types": rec.restaurant.cuisine_values,
+                "vibes": rec.restaurant.vibe_values,
                 "your_rating": rec.restaurant.personal_rating
             }
             similar_info["similar_restaurants"].append(similar_data)
         
-        return json.dumps(similar_info, indent=2)
+        return _dumps(similar_info)
     
     except Exception as e:
         logger.error(f"Failed to find similar restaurants: {e}")
@@ -507,7 +551,7 @@ async def enrich_restaurant_database(user_id: str = "default") -> str:
         user_id: User identifier
     """
     try:
-        result = await restaurant_manager.enrich_restaurant_database()
+        result = await _restaurant_manager().enrich_restaurant_database()
         
         if result["success"]:
             return f"✅ Database enrichment completed! {result['message']}"
@@ -543,10 +587,7 @@ async def start_interactive_session(
         location = Location(city=city, state=state)
         
         # Parse occasion
-        try:
-            occasion_type = OccasionType(occasion)
-        except ValueError:
-            occasion_type = OccasionType.CASUAL_DINING
+        occasion_type = OCCASION_BY_NAME.get((occasion or "").lower(), OccasionType.CASUAL_DINING)
         
         # Build recommendation context
         context = RecommendationContext(
@@ -558,12 +599,12 @@ async def start_interactive_session(
         )
         
         # Start session
-        session = await restaurant_manager.start_interactive_session(user_id, context)
+        session = await _restaurant_manager().start_interactive_session(user_id, context)
         
         session_info = {
             "session_id": session.session_id,
             "user_id": session.user_id,
-            "location": f"{location.city}, {location.state}",
+            "location": location.display,
             "occasion": occasion,
             "initial_recommendations": []
         }
@@ -574,12 +615,12 @@ async def start_interactive_session(
                 "name": rec.restaurant.name,
                 "score": round(rec.score, 2),
                 "reasoning": rec.reasoning,
-                "cuisine_types": [c.value for c in rec.restaurant.cuisine_types],
-                "vibes": [v.value for v in rec.restaurant.vibes]
+                "cuisine_types": rec.restaurant.cuisine_values,
+                "vibes": rec.restaurant.vibe_values
             }
             session_info["initial_recommendations"].append(rec_data)
         
-        return json.dumps(session_info, indent=2)
+        return _dumps(session_info)
     
     except Exception as e:
         logger.error(f"Failed to start interactive session: {e}")
@@ -617,25 +658,17 @@ async def provide_session_feedback(
         if disliked_restaurant_ids:
             disliked_ids = [id.strip() for id in disliked_restaurant_ids.split(",")]
         
-        # Parse cuisine feedback
-        cuisine_feedback = {}
-        if cuisine_preferences:
-            cuisine_names = [c.strip() for c in cuisine_preferences.split(",")]
-            for cuisine_name in cuisine_names:
-                try:
-                    cuisine_feedback[CuisineType(cuisine_name)] = 5.0  # High preference
-                except ValueError:
-                    logger.warning(f"Invalid cuisine type: {cuisine_name}")
-        
-        # Parse vibe feedback
-        vibe_feedback = {}
-        if vibe_preferences:
-            vibe_names = [v.strip() for v in vibe_preferences.split(",")]
-            for vibe_name in vibe_names:
-                try:
-                    vibe_feedback[VibeType(vibe_name)] = 5.0  # High preference
-                except ValueError:
-                    logger.warning(f"Invalid vibe type: {vibe_name}")
+        # Parse cuisine feedback; listed cuisines count as a high preference
+        cuisine_feedback = {
+            cuisine: 5.0
+            for cuisine in _parse_csv(cuisine_preferences, CUISINE_BY_NAME, "cuisine type")
+        }
+        
+        # Parse vibe feedback; listed vibes count as a high preference
+        vibe_feedback = {
+            vibe: 5.0
+            for vibe in _parse_csv(vibe_preferences, VIBE_BY_NAME, "vibe type")
+        }
         
         # Create feedback
         feedback = SessionFeedback(
@@ -648,7 +681,7 @@ async def provide_session_feedback(
         )
         
         # Process feedback
-        result = await restaurant_manager.process_session_feedback(session_id, feedback)
+        result = await _restaurant_manager().process_session_feedback(session_id, feedback)
         
         if result["success"]:
             return f"✅ Feedback processed successfully! Your preferences have been updated."
@@ -670,7 +703,7 @@ async def get_session_recommendations(session_id: str = None) -> str:
         if not session_id:
             return "Error: Session ID is required"
         
-        recommendations = await restaurant_manager.get_session_recommendations(session_id)
+        recommendations = await _restaurant_manager().get_session_recommendations(session_id)
         
         if not recommendations:
             return "No recommendations found for this session"
@@ -686,18 +719,25 @@ async def get_session_recommendations(session_id: str = None) -> str:
                 "name": rec.restaurant.name,
                 "score": round(rec.score, 2),
                 "reasoning": rec.reasoning,
-                "location": f"{rec.restaurant.location.city}, {rec.restaurant.location.state}",
-                "cuisine_types": [c.value for c in rec.restaurant.cuisine_types],
-                "vibes": [v.value for v in rec.restaurant.vibes]
+                "location": rec.restaurant.location.display,
+                "cuisine_types": rec.restaurant.cuisine_values,
+                "vibes": rec.restaurant.vibe_values
             }
             rec_info["refined_recommendations"].append(rec_data)
         
-        return json.dumps(rec_info, indent=2)
+        return _dumps(rec_info)
     
     except Exception as e:
         logger.error(f"Failed to get session recommendations: {e}")
         return f"Error getting session recommendations: {str(e)}"
 
+async def _connection_check(check: Awaitable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Await a connection check, reporting a failure if the API does not answer in time."""
+    try:
+        return await asyncio.wait_for(check, timeout=_CONNECTION_CHECK_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        return {"success": False, "error": f"No response within {_CONNECTION_CHECK_TIMEOUT_SECONDS:g}s"}
+
 @mcp.tool()
 async def test_connections(user_id: str = "default") -> str:
     """Test connections to Notion and Google Maps APIs.
@@ -706,13 +746,20 @@ async def test_connections(user_id: str = "default") -> str:
         user_id: User identifier
     """
     try:
+        # The Google Maps check is a blocking call; run it off the loop while
+        # the Notion check is in flight
+        loop = asyncio.get_running_loop()
+        notion_status, maps_status = await asyncio.gather(
+            _connection_check(_notion_client().test_connection()),
+            _connection_check(loop.run_in_executor(None, get_maps_client().test_connection))
+        )
         results = {
-            "notion": await notion_client.test_connection(),
-            "google_maps": maps_client.test_connection(),
+            "notion": notion_status,
+            "google_maps": maps_status,
             "timestamp": datetime.now().isoformat()
         }
         
-        return json.dumps(results, indent=2)
+        return _dumps(results)
     
     except Exception as e:
         logger.error(f"Failed to test connections: {e}")
@@ -732,7 +779,7 @@ async def get_favorite_restaurants(
         limit: Maximum number of restaurants to return
     """
     try:
-        restaurants = await notion_client.get_all_restaurants()
+        restaurants = await _notion_client().get_all_restaurants()
         
         # Filter for favorites (restaurants with ratings >= min_rating)
         favorites = [r for r in restaurants if r.personal_rating and r.personal_rating >= min_rating]
@@ -746,22 +793,12 @@ async def get_favorite_restaurants(
         favorites_info = {
             "total_favorites": len(favorites),
             "criteria": f"Rating >= {min_rating}",
-            "restaurants": []
+            "restaurants": _summarize(favorites[:limit], (
+                "name", "rating", "date_visited", "location", "cuisine_types", "price_range", "notes"
+            ))
         }
         
-        for restaurant in favorites[:limit]:
-            restaurant_data = {
-                "name": restaurant.name,
-                "rating": restaurant.personal_rating,
-                "date_visited": restaurant.date_visited.isoformat() if restaurant.date_visited else None,
-                "location": f"{restaurant.location.city}, {restaurant.location.state}" if restaurant.location.state else restaurant.location.city,
-                "cuisine_types": [c.value for c in restaurant.cuisine_types],
-                "price_range": restaurant.price_range.value if restaurant.price_range else None,
-                "notes": restaurant.notes
-            }
-            favorites_info["restaurants"].append(restaurant_data)
-        
-        return json.dumps(favorites_info, indent=2)
+        return _dumps(favorites_info)
         
     except Exception as e:
         logger.error(f"Failed to get favorite restaurants: {e}")
@@ -779,10 +816,12 @@ async def search_restaurants_by_name(
         user_id: User identifier
     """
     try:
-        restaurants = await notion_client.get_all_restaurants()
+        # Notion does the substring match, so only matching pages are fetched
+        restaurants = await _notion_client().search_by_name(query)
         
         # Search for restaurants with names containing the query (case insensitive)
-        matching_restaurants = [r for r in restaurants if query.lower() in r.name.lower()]
+        folded_query = query.casefold()
+        matching_restaurants = [r for r in restaurants if folded_query in r.folded_name]
         
         if not matching_restaurants:
             return f"No restaurants found matching '{query}'"
@@ -793,23 +832,12 @@ async def search_restaurants_by_name(
         search_results = {
             "query": query,
             "total_matches": len(matching_restaurants),
-            "restaurants": []
+            "restaurants": _summarize(matching_restaurants, (
+                "name", "rating", "date_visited", "location", "cuisine_types", "price_range", "notes", "revisit"
+            ))
         }
         
-        for restaurant in matching_restaurants:
-            restaurant_data = {
-                "name": restaurant.name,
-                "rating": restaurant.personal_rating,
-                "date_visited": restaurant.date_visited.isoformat() if restaurant.date_visited else None,
-                "location": f"{restaurant.location.city}, {restaurant.location.state}" if restaurant.location.state else restaurant.location.city,
-                "cuisine_types": [c.value for c in restaurant.cuisine_types],
-                "price_range": restaurant.price_range.value if restaurant.price_range else None,
-                "notes": restaurant.notes,
-                "revisit": restaurant.revisit
-            }
-            search_results["restaurants"].append(restaurant_data)
-        
-        return json.dumps(search_results, indent=2)
+        return _dumps(search_results)
         
     except Exception as e:
         logger.error(f"Failed to search restaurants: {e}")
@@ -829,38 +857,24 @@ async def get_recent_visits(
         limit: Maximum number of visits to return
     """
     try:
-        restaurants = await notion_client.get_all_restaurants()
+        index = await _restaurant_manager().get_visit_index()
         
-        # Filter for recent visits
+        # Recent visits, most recent first
         cutoff_date = datetime.now() - timedelta(days=days)
-        recent_visits = [r for r in restaurants if r.date_visited and r.date_visited >= cutoff_date]
+        recent_visits = index.visited_since(cutoff_date)
         
         if not recent_visits:
             return f"No restaurant visits found in the last {days} days"
         
-        # Sort by date visited (most recent first)
-        recent_visits.sort(key=lambda r: r.date_visited or datetime.min, reverse=True)
-        
         visits_info = {
             "period": f"Last {days} days",
             "total_visits": len(recent_visits),
-            "visits": []
+            "visits": _summarize(recent_visits[:limit], (
+                "name", "date_visited", "rating", "location", "cuisine_types", "price_range", "notes", "revisit"
+            ))
         }
         
-        for restaurant in recent_visits[:limit]:
-            visit_data = {
-                "name": restaurant.name,
-                "date_visited": restaurant.date_visited.isoformat() if restaurant.date_visited else None,
-                "rating": restaurant.personal_rating,
-                "location": f"{restaurant.location.city}, {restaurant.location.state}" if restaurant.location.state else restaurant.location.city,
-                "cuisine_types": [c.value for c in restaurant.cuisine_types],
-                "price_range": restaurant.price_range.value if restaurant.price_range else None,
-                "notes": restaurant.notes,
-                "revisit": restaurant.revisit
-            }
-            visits_info["visits"].append(visit_data)
-        
-        return json.dumps(visits_info, indent=2)
+        return _dumps(visits_info)
         
     except Exception as e:
         logger.error(f"Failed to get recent visits: {e}")
@@ -882,21 +896,10 @@ async def get_restaurants_by_rating(
         limit: Maximum number of restaurants to return
     """
     try:
-        restaurants = await notion_client.get_all_restaurants()
+        index = await _restaurant_manager().get_visit_index()
         
-        # Filter by rating range
-        filtered_restaurants = []
-        for restaurant in restaurants:
-            if restaurant.personal_rating is None:
-                continue
-            
-            if min_rating is not None and restaurant.personal_rating < min_rating:
-                continue
-                
-            if max_rating is not None and restaurant.personal_rating > max_rating:
-                continue
-                
-            filtered_restaurants.append(restaurant)
+        # Rated restaurants in range, highest rated (then most recent) first
+        filtered_restaurants = index.rated_between(min_rating, max_rating)
         
         if not filtered_restaurants:
             rating_criteria = []
@@ -907,32 +910,18 @@ async def get_restaurants_by_rating(
             criteria_str = " and ".join(rating_criteria) if rating_criteria else "any rating"
             return f"No restaurants found with rating {criteria_str}"
         
-        # Sort by rating (highest first), then by date visited (most recent first)
-        filtered_restaurants.sort(key=lambda r: (r.personal_rating or 0, r.date_visited or datetime.min), reverse=True)
-        
         rating_info = {
             "criteria": {
                 "min_rating": min_rating,
                 "max_rating": max_rating
             },
             "total_matches": len(filtered_restaurants),
-            "restaurants": []
+            "restaurants": _summarize(filtered_restaurants[:limit], (
+                "name", "rating", "date_visited", "location", "cuisine_types", "price_range", "notes", "revisit"
+            ))
         }
         
-        for restaurant in filtered_restaurants[:limit]:
-            restaurant_data = {
-                "name": restaurant.name,
-                "rating": restaurant.personal_rating,
-                "date_visited": restaurant.date_visited.isoformat() if restaurant.date_visited else None,
-                "location": f"{restaurant.location.city}, {restaurant.location.state}" if restaurant.location.state else restaurant.location.city,
-                "cuisine_types": [c.value for c in restaurant.cuisine_types],
-                "price_range": restaurant.price_range.value if restaurant.price_range else None,
-                "notes": restaurant.notes,
-                "revisit": restaurant.revisit
-            }
-            rating_info["restaurants"].append(restaurant_data)
-        
-        return json.dumps(rating_info, indent=2)
+        return _dumps(rating_info)
         
     except Exception as e:
         logger.error(f"Failed to get restaurants by rating: {e}")
@@ -952,11 +941,20 @@ def main():
     logger.info(f"Notion configured: {config_status['settings']['notion_configured']}")
     logger.info(f"Google Maps configured: {config_status['settings']['google_maps_configured']}")
     
+    # Set up the API clients now rather than on the first tool call
+    _restaurant_manager()
+    
     # Run the server
     logger.info("MCP Server ready to accept connections")
     
+    # Use uvloop's event loop when installed (see the "speedups" extra)
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+    
     # Start the MCP server with stdio transport
-    import asyncio
     asyncio.run(mcp.run_stdio_async())
     
 if __name__ == "__main__":
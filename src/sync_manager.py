@@ -2,19 +2,22 @@
 
 import asyncio
 import logging
-from typing import Dict, List, Optional, Any
-from datetime import datetime, timedelta
-import schedule
 import time
-from threading import Thread
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from datetime import datetime, timedelta
 
+from .models import Restaurant
 from .notion_manager import NotionManager
 from .maps_client import GoogleMapsClient
 from .restaurant_manager import RestaurantManager
-from .config import settings
 
 logger = logging.getLogger(__name__)
 
+# detect_notion_changes results are served as-is while fresh, served and
+# refreshed in the background while stale, and refetched once expired
+_CHANGES_FRESH_SECONDS = 30
+_CHANGES_STALE_SECONDS = 300
+
 
 class SyncManager:
     """Manages automated data enrichment and real-time synchronization."""
@@ -25,11 +28,16 @@ class SyncManager:
         self.maps = maps_client
         self.restaurant_manager = restaurant_manager
         self.is_running = False
-        self.sync_thread = None
+        # One task per periodic job, and when each job runs next
+        self._tasks: List[asyncio.Task] = []
+        self._next_runs: Dict[str, datetime] = {}
         self.last_sync = None
+        # (time.monotonic() when fetched, last_sync it was relative to, changes)
+        self._changes_cache: Optional[Tuple[float, Optional[datetime], List[Dict[str, Any]]]] = None
+        self._changes_refresh: Optional[asyncio.Task] = None
     
     def start_sync_scheduler(self):
-        """Start the automated sync scheduler."""
+        """Start the automated sync scheduler on the running event loop."""
         if self.is_running:
             logger.warning("Sync scheduler already running")
             return
@@ -37,153 +45,137 @@ class SyncManager:
         self.is_running = True
         
         # Schedule periodic tasks
-        schedule.every(1).hours.do(self._sync_recent_changes)
-        schedule.every(6).hours.do(self._enrich_missing_data)
-        schedule.every(24).hours.do(self._full_database_sync)
-        
-        # Start scheduler thread
-        self.sync_thread = Thread(target=self._run_scheduler, daemon=True)
-        self.sync_thread.start()
+        self._tasks = [
+            asyncio.ensure_future(self._every(timedelta(hours=1), self._sync_recent_changes)),
+            asyncio.ensure_future(self._every(timedelta(hours=6), self._enrich_missing_data)),
+            asyncio.ensure_future(self._every(timedelta(hours=24), self._full_database_sync)),
+        ]
         
         logger.info("Sync scheduler started")
     
-    def stop_sync_scheduler(self):
+    async def stop_sync_scheduler(self):
         """Stop the automated sync scheduler."""
         if not self.is_running:
             logger.warning("Sync scheduler not running")
             return
         
         self.is_running = False
-        schedule.clear()
-        
-        if self.sync_thread:
-            self.sync_thread.join(timeout=5)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._next_runs.clear()
         
         logger.info("Sync scheduler stopped")
     
-    def _run_scheduler(self):
-        """Run the scheduler in a separate thread."""
+    async def _every(self, interval: timedelta, job: Callable[[], Awaitable[None]]):
+        """Run ``job`` once per ``interval``, starting one interval from now."""
         while self.is_running:
-            try:
-                schedule.run_pending()
-                time.sleep(60)  # Check every minute
-            except Exception as e:
-                logger.error(f"Scheduler error: {e}")
-                time.sleep(60)
+            self._next_runs[job.__name__] = datetime.now() + interval
+            await asyncio.sleep(interval.total_seconds())
+            await job()
+    
+    async def _enrich_and_update(self, restaurants: List[Restaurant]) -> List[Any]:
+        """Enrich restaurants with Google Maps data and write them back to Notion.
+        
+        Copies are enriched by ``GoogleMapsClient.enrich_restaurants`` and
+        then written in one batch. Each result is the ``update_restaurant``
+        response, ``None`` if no Google data was found, or the exception
+        raised while enriching that restaurant.
+        """
+        results = await self.maps.enrich_restaurants(restaurants)
+        
+        # Indices of the restaurants that came back with Google data
+        to_update = [
+            i for i, result in enumerate(results)
+            if not isinstance(result, BaseException) and result.google_places_data
+        ]
+        updates = await self.notion.update_restaurants_batch(
+            [(restaurants[i].notion_page_id, results[i]) for i in to_update]
+        )
+        
+        results = [result if isinstance(result, BaseException) else None for result in results]
+        for i, update in zip(to_update, updates):
+            results[i] = update
+        return results
+    
+    def _count_updates(self, restaurants: List[Restaurant], results: List[Any], action: str) -> int:
+        """Log per-restaurant failures and count successful Notion updates."""
+        count = 0
+        for restaurant, result in zip(restaurants, results):
+            if isinstance(result, BaseException):
+                logger.warning(f"Failed to {action} restaurant {restaurant.name}: {result}")
+            elif result and result["success"]:
+                count += 1
+        return count
     
-    def _sync_recent_changes(self):
+    async def _sync_recent_changes(self):
         """Sync recent changes from Notion database."""
         try:
             logger.info("Starting sync of recent changes...")
+            # Notion stamps last_edited_time to the minute, so an edit later in
+            # this minute would sort before a finer-grained cursor
+            started_at = datetime.now().replace(second=0, microsecond=0)
             
-            # Get recent restaurants (last 24 hours)
-            recent_restaurants = asyncio.run(self.notion.get_recent_visits(limit=50))
+            # Only pages edited since the last sync; the latest visits on the first run
+            if self.last_sync:
+                recent_restaurants = await self.notion.get_restaurants_edited_since(self.last_sync)
+            else:
+                recent_restaurants = await self.notion.get_recent_visits(limit=50)
             
-            enriched_count = 0
-            for restaurant in recent_restaurants:
-                try:
-                    # Skip if already enriched recently
-                    if (restaurant.google_places_data and 
-                        restaurant.updated_at and 
-                        restaurant.updated_at > datetime.now() - timedelta(hours=24)):
-                        continue
-                    
-                    # Enrich with Google Maps data
-                    enriched_restaurant = asyncio.run(self.maps.enrich_restaurant_data(restaurant))
-                    
-                    if enriched_restaurant.google_places_data:
-                        asyncio.run(self.notion.update_restaurant(
-                            restaurant.notion_page_id,
-                            enriched_restaurant
-                        ))
-                        enriched_count += 1
-                    
-                    # Small delay to avoid rate limiting
-                    time.sleep(0.2)
-                    
-                except Exception as e:
-                    logger.warning(f"Failed to sync restaurant {restaurant.name}: {e}")
-                    continue
+            # Skip restaurants that are already enriched
+            pending = [
+                restaurant for restaurant in recent_restaurants
+                if not (restaurant.google_places_data and restaurant.google_places_data.place_id)
+            ]
             
-            self.last_sync = datetime.now()
+            results = await self._enrich_and_update(pending)
+            enriched_count = self._count_updates(pending, results, "sync")
+            
+            # Edits made while this pass ran are picked up by the next one
+            self.last_sync = started_at
             logger.info(f"Recent changes sync completed. Enriched {enriched_count} restaurants.")
             
         except Exception as e:
             logger.error(f"Failed to sync recent changes: {e}")
     
-    def _enrich_missing_data(self):
+    async def _enrich_missing_data(self):
         """Enrich restaurants that are missing Google Maps data."""
         try:
             logger.info("Starting enrichment of missing data...")
             
-            # Get all restaurants
-            all_restaurants = asyncio.run(self.notion.get_all_restaurants())
+            # Let Notion find the restaurants missing Google data, 20 per run
+            pending = await self.notion.get_restaurants_missing_place_id(limit=20)
             
-            # Filter restaurants missing Google data
-            missing_data_restaurants = [
-                r for r in all_restaurants 
-                if not r.google_places_data or not r.google_places_data.place_id
-            ]
-            
-            logger.info(f"Found {len(missing_data_restaurants)} restaurants missing Google data")
+            logger.info(f"Found {len(pending)} restaurants missing Google data")
             
-            enriched_count = 0
-            for restaurant in missing_data_restaurants[:20]:  # Limit to 20 per run
-                try:
-                    enriched_restaurant = asyncio.run(self.maps.enrich_restaurant_data(restaurant))
-                    
-                    if enriched_restaurant.google_places_data:
-                        asyncio.run(self.notion.update_restaurant(
-                            restaurant.notion_page_id,
-                            enriched_restaurant
-                        ))
-                        enriched_count += 1
-                    
-                    # Delay to avoid rate limiting
-                    time.sleep(0.5)
-                    
-                except Exception as e:
-                    logger.warning(f"Failed to enrich restaurant {restaurant.name}: {e}")
-                    continue
+            results = await self._enrich_and_update(pending)
+            enriched_count = self._count_updates(pending, results, "enrich")
             
             logger.info(f"Missing data enrichment completed. Enriched {enriched_count} restaurants.")
             
         except Exception as e:
             logger.error(f"Failed to enrich missing data: {e}")
     
-    def _full_database_sync(self):
+    async def _full_database_sync(self):
         """Perform full database synchronization."""
         try:
             logger.info("Starting full database sync...")
             
-            # Get all restaurants
-            all_restaurants = asyncio.run(self.notion.get_all_restaurants())
+            # Get all restaurants, bypassing the short-lived query cache
+            self.notion.invalidate_cache()
+            all_restaurants = await self.notion.get_all_restaurants()
             
-            # Update all restaurant data
-            updated_count = 0
-            for restaurant in all_restaurants:
-                try:
-                    # Check if data is stale (older than 7 days)
-                    if (restaurant.updated_at and 
-                        restaurant.updated_at > datetime.now() - timedelta(days=7)):
-                        continue
-                    
-                    # Re-enrich with latest Google Maps data
-                    enriched_restaurant = asyncio.run(self.maps.enrich_restaurant_data(restaurant))
-                    
-                    if enriched_restaurant.google_places_data:
-                        asyncio.run(self.notion.update_restaurant(
-                            restaurant.notion_page_id,
-                            enriched_restaurant
-                        ))
-                        updated_count += 1
-                    
-                    # Delay to avoid rate limiting
-                    time.sleep(1)
-                    
-                except Exception as e:
-                    logger.warning(f"Failed to sync restaurant {restaurant.name}: {e}")
-                    continue
+            # Re-enrich restaurants whose pages haven't been edited in 7 days
+            # (updated_at is the page's last_edited_time)
+            stale_before = datetime.now() - timedelta(days=7)
+            pending = [
+                restaurant for restaurant in all_restaurants
+                if not (restaurant.updated_at and restaurant.updated_at > stale_before)
+            ]
+            
+            results = await self._enrich_and_update(pending)
+            updated_count = self._count_updates(pending, results, "sync")
             
             logger.info(f"Full database sync completed. Updated {updated_count} restaurants.")
             
@@ -206,35 +198,23 @@ class SyncManager:
                 "errors": []
             }
             
-            for restaurant in all_restaurants:
-                try:
-                    # Enrich with Google Maps data
-                    enriched_restaurant = await self.maps.enrich_restaurant_data(restaurant)
-                    
-                    if enriched_restaurant.google_places_data:
-                        # Update in Notion
-                        result = await self.notion.update_restaurant(
-                            restaurant.notion_page_id,
-                            enriched_restaurant
-                        )
-                        
-                        if result["success"]:
-                            if restaurant.google_places_data:
-                                sync_results["updated_count"] += 1
-                            else:
-                                sync_results["enriched_count"] += 1
-                        else:
-                            sync_results["failed_count"] += 1
-                            sync_results["errors"].append(f"Failed to update {restaurant.name}: {result.get('error', 'Unknown error')}")
-                    
-                    # Small delay to avoid rate limiting
-                    await asyncio.sleep(0.1)
-                    
-                except Exception as e:
+            results = await self._enrich_and_update(all_restaurants)
+            
+            for restaurant, result in zip(all_restaurants, results):
+                if isinstance(result, BaseException):
                     sync_results["failed_count"] += 1
-                    sync_results["errors"].append(f"Failed to process {restaurant.name}: {str(e)}")
-                    logger.warning(f"Failed to sync restaurant {restaurant.name}: {e}")
+                    sync_results["errors"].append(f"Failed to process {restaurant.name}: {str(result)}")
+                    logger.warning(f"Failed to sync restaurant {restaurant.name}: {result}")
+                elif result is None:
                     continue
+                elif result["success"]:
+                    if restaurant.google_places_data:
+                        sync_results["updated_count"] += 1
+                    else:
+                        sync_results["enriched_count"] += 1
+                else:
+                    sync_results["failed_count"] += 1
+                    sync_results["errors"].append(f"Failed to update {restaurant.name}: {result.get('error', 'Unknown error')}")
             
             self.last_sync = datetime.now()
             
@@ -284,43 +264,76 @@ class SyncManager:
             }
     
     async def detect_notion_changes(self) -> List[Dict[str, Any]]:
-        """Detect changes in Notion database since last sync."""
+        """Detect changes in Notion database since last sync.
+        
+        Status pages poll this, so a recent result is reused: a result older
+        than ``_CHANGES_FRESH_SECONDS`` is still returned immediately while a
+        refresh runs in the background, up to ``_CHANGES_STALE_SECONDS``.
+        """
         try:
-            if not self.last_sync:
-                # If no previous sync, consider all restaurants as new
-                restaurants = await self.notion.get_all_restaurants()
-                return [{"type": "new", "restaurant": r.name} for r in restaurants]
+            cached = self._changes_cache
+            if cached and cached[1] == self.last_sync:
+                age = time.monotonic() - cached[0]
+                if age < _CHANGES_STALE_SECONDS:
+                    if age >= _CHANGES_FRESH_SECONDS and (
+                        self._changes_refresh is None or self._changes_refresh.done()
+                    ):
+                        self._changes_refresh = asyncio.ensure_future(self._refresh_changes_in_background())
+                    return list(cached[2])
             
-            # Get recent visits since last sync
-            recent_restaurants = await self.notion.get_recent_visits(limit=100)
-            
-            changes = []
-            for restaurant in recent_restaurants:
-                if restaurant.updated_at and restaurant.updated_at > self.last_sync:
-                    if restaurant.date_visited and restaurant.date_visited > self.last_sync:
-                        changes.append({
-                            "type": "new_visit",
-                            "restaurant": restaurant.name,
-                            "date": restaurant.date_visited.isoformat()
-                        })
-                    else:
-                        changes.append({
-                            "type": "updated",
-                            "restaurant": restaurant.name,
-                            "updated": restaurant.updated_at.isoformat()
-                        })
-            
-            return changes
+            return list(await self._refresh_changes())
             
         except Exception as e:
             logger.error(f"Failed to detect Notion changes: {e}")
             return []
     
+    async def _refresh_changes_in_background(self):
+        """Refresh the cached changes, logging (not raising) failures."""
+        try:
+            await self._refresh_changes()
+        except Exception as e:
+            logger.warning(f"Failed to refresh Notion changes: {e}")
+    
+    async def _refresh_changes(self) -> List[Dict[str, Any]]:
+        """Fetch the changes since last sync and cache them."""
+        last_sync = self.last_sync
+        changes = await self._fetch_notion_changes(last_sync)
+        self._changes_cache = (time.monotonic(), last_sync, changes)
+        return changes
+    
+    async def _fetch_notion_changes(self, last_sync: Optional[datetime]) -> List[Dict[str, Any]]:
+        """List the restaurants added or updated in Notion since ``last_sync``."""
+        if not last_sync:
+            # If no previous sync, consider all restaurants as new
+            restaurants = await self.notion.get_all_restaurants()
+            return [{"type": "new", "restaurant": r.name} for r in restaurants]
+        
+        # Get recent visits since last sync
+        recent_restaurants = await self.notion.get_recent_visits(limit=100)
+        
+        changes = []
+        for restaurant in recent_restaurants:
+            if restaurant.updated_at and restaurant.updated_at > last_sync:
+                if restaurant.date_visited and restaurant.date_visited > last_sync:
+                    changes.append({
+                        "type": "new_visit",
+                        "restaurant": restaurant.name,
+                        "date": restaurant.date_visited.isoformat()
+                    })
+                else:
+                    changes.append({
+                        "type": "updated",
+                        "restaurant": restaurant.name,
+                        "updated": restaurant.updated_at.isoformat()
+                    })
+        
+        return changes
+    
     def get_sync_status(self) -> Dict[str, Any]:
         """Get current sync status."""
         return {
             "is_running": self.is_running,
             "last_sync": self.last_sync.isoformat() if self.last_sync else None,
-            "next_sync": schedule.next_run().isoformat() if schedule.jobs else None,
-            "scheduled_jobs": len(schedule.jobs)
-        }
\ No newline at end of file
+            "next_sync": min(self._next_runs.values()).isoformat() if self._next_runs else None,
+            "scheduled_jobs": len(self._tasks)
+        }
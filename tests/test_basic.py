@@ -5,13 +5,28 @@ import sys
 import os
 import pytest
 import asyncio
+from datetime import datetime, timedelta, timezone
 from unittest.mock import Mock, patch
 
+import httpx
+from notion_client.errors import (
+    APIResponseError, HTTPResponseError, RequestTimeoutError, UnknownHTTPResponseError
+)
+
 # Add src directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from src.models import Restaurant, Location, CuisineType, PriceRange, VibeType
+from src.models import (
+    Restaurant, Location, GooglePlacesData, CuisineType, PriceRange, VibeType, OccasionType,
+    UserPreferences, UserProfile, RecommendationContext, CUISINE_BY_NAME, VIBE_BY_NAME
+)
 from src.config import validate_configuration
+from src.cache import TTLCache
+from src.notion_manager import NotionManager, _WRITE_INTERVAL_SECONDS, _WRITE_RETRIES
+from src.restaurant_index import RestaurantColumns, VisitIndex
+from src.sync_manager import SyncManager
+from src.restaurant_manager import RestaurantManager, _OCCASION_VIBES
+from src.maps_client import GoogleMapsClient
 
 def test_configuration_validation():
     """Test configuration validation."""
@@ -84,6 +99,594 @@ def test_vibe_type_enum():
     assert VibeType.ROMANTIC.value == "romantic"
     assert VibeType.FAMILY_FRIENDLY.value == "family-friendly"
 
+def test_enum_name_lookup():
+    """Test case-insensitive enum lookups for tool arguments."""
+    assert CUISINE_BY_NAME["italian"] is CuisineType.ITALIAN
+    assert CUISINE_BY_NAME.get("Italian".lower()) is CuisineType.ITALIAN
+    assert VIBE_BY_NAME["family-friendly"] is VibeType.FAMILY_FRIENDLY
+    assert CUISINE_BY_NAME.get("not a cuisine") is None
+
+def test_ttl_cache_get_or_set():
+    """Test TTLCache expiry and shared fetches."""
+    cache = TTLCache(maxsize=2, ttl=60)
+    calls = []
+    
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0)
+        return "value"
+    
+    async def run():
+        return await asyncio.gather(*[cache.get_or_set("key", fetch) for _ in range(3)])
+    
+    assert asyncio.run(run()) == ["value", "value", "value"]
+    assert len(calls) == 1
+    assert cache.get("key") == "value"
+    
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert "key" not in cache  # evicted as least recently used
+    
+    expired = TTLCache(ttl=0)
+    expired.set("key", "value")
+    assert expired.get("key") is None
+
+def test_ttl_cache_cancelled_caller():
+    """Test that cancelling one caller does not cancel a shared fetch."""
+    cache = TTLCache(ttl=60)
+    
+    async def fetch():
+        await asyncio.sleep(0.05)
+        return "value"
+    
+    async def run():
+        first = asyncio.ensure_future(cache.get_or_set("key", fetch))
+        second = asyncio.ensure_future(cache.get_or_set("key", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second, first.cancelled()
+    
+    assert asyncio.run(run()) == ("value", True)
+    
+    async def cancel_only_caller():
+        caller = asyncio.ensure_future(cache.get_or_set("other", fetch))
+        await asyncio.sleep(0)
+        caller.cancel()
+        await asyncio.sleep(0.1)
+    
+    # The fetch outlives its only caller and its result is still cached
+    asyncio.run(cancel_only_caller())
+    assert cache.get("other") == "value"
+    assert not cache._inflight
+
+def test_ttl_cache_clear_during_fetch():
+    """Test that a fetch started before clear() doesn't cache its result."""
+    cache = TTLCache(ttl=60)
+    
+    async def fetch():
+        await asyncio.sleep(0.01)
+        return "before clear"
+    
+    async def run():
+        pending = asyncio.ensure_future(cache.get_or_set("key", fetch))
+        await asyncio.sleep(0)
+        cache.clear()
+        return await pending
+    
+    assert asyncio.run(run()) == "before clear"
+    assert "key" not in cache
+
+def test_visit_index_ranges():
+    """Test that VisitIndex range queries match a filter-and-sort over the list."""
+    location = Location(city="New York")
+    restaurants = [
+        Restaurant(name="A", location=location, personal_rating=4.0, date_visited=datetime(2024, 3, 1)),
+        Restaurant(name="B", location=location, personal_rating=5.0, date_visited=datetime(2024, 1, 1)),
+        Restaurant(name="C", location=location, personal_rating=4.0, date_visited=datetime(2024, 2, 1)),
+        Restaurant(name="D", location=location, personal_rating=3.0),
+        Restaurant(name="E", location=location, date_visited=datetime(2024, 2, 15)),
+    ]
+    index = VisitIndex(restaurants)
+    
+    assert [r.name for r in index.visited_since(datetime(2024, 2, 1))] == ["A", "E", "C"]
+    assert index.visited_since(datetime(2025, 1, 1)) == []
+    assert [r.name for r in index.rated_between(4.0)] == ["B", "A", "C"]
+    assert [r.name for r in index.rated_between(max_rating=4.0)] == ["A", "C", "D"]
+    assert [r.name for r in index.rated_between(3.5, 4.5)] == ["A", "C"]
+    assert index.rated_between(4.5, 4.0) == []
+
+def test_recent_sync_cursor_is_minute_aligned():
+    """Test that the hourly sync cursor can't skip edits in its start minute."""
+    calls = []
+    
+    class FakeNotion:
+        async def get_recent_visits(self, limit=10):
+            calls.append(("recent", limit))
+            return []
+        
+        async def get_restaurants_edited_since(self, since):
+            calls.append(("since", since))
+            return []
+        
+        async def update_restaurants_batch(self, updates):
+            return []
+    
+    maps = GoogleMapsClient.__new__(GoogleMapsClient)
+    maps.enrich_concurrency = 2
+    sync = SyncManager(FakeNotion(), maps, None)
+    before = datetime.now()
+    asyncio.run(sync._sync_recent_changes())
+    asyncio.run(sync._sync_recent_changes())
+    
+    assert calls[0] == ("recent", 50)
+    cursor = calls[1][1]
+    assert cursor == sync.last_sync
+    # Notion's last_edited_time has minute precision; an edit made in the same
+    # minute the first pass started must still be on or after the cursor
+    assert cursor.second == 0 and cursor.microsecond == 0
+    assert cursor <= before.replace(second=0, microsecond=0)
+
+def test_enrich_restaurants_copies_and_bounds():
+    """Test that bulk enrichment edits copies, caps concurrency and returns errors in place."""
+    location = Location(city="New York")
+    restaurants = [Restaurant(name=name, location=location) for name in ("a", "b", "fails", "c")]
+    maps = GoogleMapsClient.__new__(GoogleMapsClient)
+    maps.enrich_concurrency = 2
+    active = [0, 0]  # current, peak
+    
+    async def enrich_restaurant_data(restaurant):
+        active[0] += 1
+        active[1] = max(active)
+        await asyncio.sleep(0.01)
+        active[0] -= 1
+        if restaurant.name == "fails":
+            raise ValueError("maps down")
+        restaurant.location.latitude = 1.0
+        return restaurant
+    
+    maps.enrich_restaurant_data = enrich_restaurant_data
+    results = asyncio.run(maps.enrich_restaurants(restaurants))
+    
+    assert isinstance(results[2], ValueError)
+    assert [r.location.latitude for r in results if not isinstance(r, Exception)] == [1.0] * 3
+    assert all(r.location.latitude is None for r in restaurants)
+    assert active[1] == 2
+
+def test_enrich_database_counts_and_copies():
+    """Test that enrichment leaves cached restaurants alone and counts failed writes."""
+    location = Location(city="New York")
+    cached = [
+        Restaurant(name=name, location=location, notion_page_id=name)
+        for name in ("saved", "write fails", "cancelled", "not found")
+    ]
+    
+    class FakeMaps:
+        enrich_restaurants = GoogleMapsClient.enrich_restaurants
+        
+        async def enrich_restaurant_data(self, restaurant):
+            if restaurant.name == "cancelled":
+                raise asyncio.CancelledError()
+            if restaurant.name != "not found":
+                restaurant.google_places_data = GooglePlacesData(place_id="p", name=restaurant.name)
+            return restaurant
+    
+    class FakeNotion:
+        update_restaurants_batch = NotionManager.update_restaurants_batch
+        
+        async def get_all_restaurants(self):
+            return list(cached)
+        
+        async def update_restaurant(self, page_id, restaurant):
+            return {"success": page_id != "write fails", "error": "boom"}
+    
+    manager = RestaurantManager(FakeNotion(), FakeMaps())
+    manager.maps.enrich_concurrency = 2
+    result = asyncio.run(manager.enrich_restaurant_database())
+    
+    assert result["enriched_count"] == 1
+    assert result["failed_count"] == 2
+    assert all(r.google_places_data is None for r in cached)
+
+def _scoring_fixture():
+    """Restaurants covering repeated cuisines and a vibe the masks don't know."""
+    location = Location(city="New York", latitude=40.7, longitude=-74.0)
+    places = GooglePlacesData(place_id="p", name="p", rating=4.5)
+    restaurants = [
+        Restaurant(name="Plain", location=location, cuisine_types=[CuisineType.ITALIAN],
+                   vibes=[VibeType.ROMANTIC, VibeType.COZY], price_range=PriceRange.MODERATE,
+                   google_places_data=places),
+        Restaurant(name="Repeated cuisine", location=location,
+                   cuisine_types=[CuisineType.FRENCH, CuisineType.FRENCH]),
+        Restaurant(name="Repeated vibe", location=location,
+                   vibes=[VibeType.ROMANTIC, VibeType.ROMANTIC]),
+        Restaurant(name="Other", location=location, cuisine_types=[CuisineType.MEXICAN],
+                   vibes=[VibeType.LIVELY], price_range=PriceRange.BUDGET),
+        Restaurant(name="Empty", location=location),
+    ]
+    # Built without validation, as unvalidated data could be
+    restaurants.append(restaurants[0].model_copy(update={
+        "name": "Unknown vibe", "vibes": [VibeType.ROMANTIC, "secret garden"]
+    }))
+    return restaurants
+
+def test_batch_scoring_matches_reference():
+    """Test the bitmask scorer against the per-restaurant list scan it replaced."""
+    restaurants = _scoring_fixture()
+    preferences = UserPreferences(
+        favorite_cuisines=[CuisineType.ITALIAN, CuisineType.FRENCH],
+        preferred_vibes=[VibeType.ROMANTIC, VibeType.COZY],
+        preferred_price_range=PriceRange.MODERATE,
+    )
+    profile = UserProfile(user_id="u", preferences=preferences)
+    context = RecommendationContext(user_id="u", location=Location(city="New York"),
+                                    occasion=OccasionType.DATE_NIGHT)
+    distances = [1.0, None, None, 30.0, 5.0, 2.0]
+    manager = RestaurantManager(Mock(), Mock())
+    
+    def reference(restaurant, distance):
+        cuisine = min(sum(0.3 for c in restaurant.cuisine_types if c in preferences.favorite_cuisines), 0.6)
+        price = 0.2 if restaurant.price_range and restaurant.price_range == preferences.preferred_price_range else 0.0
+        vibe = min(sum(0.1 for v in restaurant.vibes if v in preferences.preferred_vibes), 0.3)
+        near = max(0, 0.2 - (distance / context.max_distance_km) * 0.2) if distance else 0.0
+        rating = restaurant.google_places_data.rating if restaurant.google_places_data else None
+        google = min(0.2, (rating - 3.0) / 2.0 * 0.2) if rating else 0.0
+        occasion_vibes = _OCCASION_VIBES.get(context.occasion, ())
+        occasion = min(sum(0.1 for v in restaurant.vibes if v in occasion_vibes), 0.2)
+        return min(0.5 + cuisine + price + vibe + near + google + occasion, 1.0)
+    
+    scores = manager._score_restaurants(RestaurantColumns(restaurants), profile, context, distances)
+    expected = [reference(r, d) for r, d in zip(restaurants, distances)]
+    assert scores == pytest.approx(expected)
+    # Each repeat counts, as in a list scan
+    assert scores[1] == pytest.approx(1.0)  # 0.5 + 0.6, capped; once each would be 0.8
+    assert scores[2] == pytest.approx(0.5 + 0.2 + 0.2)  # once each would be 0.7
+    
+    def reference_similarity(restaurant1, restaurant2):
+        similarity = 0.4 if set(restaurant1.cuisine_types) & set(restaurant2.cuisine_types) else 0.0
+        if restaurant1.price_range and restaurant1.price_range == restaurant2.price_range:
+            similarity += 0.3
+        if set(restaurant1.vibes) & set(restaurant2.vibes):
+            similarity += 0.3
+        return similarity
+    
+    reference_restaurant = restaurants[5]
+    similarities = manager._similarities_to(reference_restaurant, RestaurantColumns(restaurants))
+    assert similarities == pytest.approx([
+        reference_similarity(reference_restaurant, r) for r in restaurants
+    ])
+
+def test_restaurant_columns_select():
+    """Test that selecting rows matches building columns from those rows."""
+    restaurants = _scoring_fixture()
+    columns = RestaurantColumns(restaurants)
+    subset = columns.select([5, 1, 0])
+    expected = RestaurantColumns([restaurants[5], restaurants[1], restaurants[0]])
+    
+    for name in RestaurantColumns.ROW_COLUMNS + ("rated_restaurants",):
+        assert getattr(subset, name) == getattr(expected, name), name
+    assert expected.exact_masks == [False, False, True]
+
+def _api_error(status, retry_after=None):
+    """Build a Notion API error with the given status."""
+    headers = httpx.Headers({"retry-after": retry_after} if retry_after else {})
+    return APIResponseError("error", status, "error", headers, "")
+
+def _run_paced(requests):
+    """Run ``_with_retries`` once per request on a fake clock; return (results, sleeps, send times)."""
+    notion = NotionManager.__new__(NotionManager)
+    notion._next_write_at = 0.0
+    clock = [100.0]
+    sleeps = []
+    sent = []
+    
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+        clock[0] += delay
+    
+    def tracked(request):
+        async def send():
+            sent.append(clock[0])
+            return await request()
+        return send
+    
+    async def run():
+        results = []
+        for request in requests:
+            try:
+                results.append(await notion._with_retries(tracked(request)))
+            except HTTPResponseError as e:
+                results.append(e.status)
+            except RequestTimeoutError:
+                results.append("timeout")
+        return results
+    
+    with patch("src.notion_manager.time.monotonic", lambda: clock[0]), \
+            patch("src.notion_manager.asyncio.sleep", fake_sleep):
+        results = asyncio.run(run())
+    return results, sleeps, sent
+
+def test_notion_write_retries():
+    """Test that writes retry on 429/5xx only, and a bounded number of times."""
+    def failing(*errors):
+        remaining = list(errors)
+        
+        async def request():
+            if remaining:
+                raise remaining.pop(0)
+            return "ok"
+        return request
+    
+    # Retry-After is honoured; 5xx backs off exponentially
+    results, sleeps, sent = _run_paced([failing(_api_error(429, "2"))])
+    assert results == ["ok"] and len(sent) == 2 and 2.0 in sleeps
+    results, sleeps, sent = _run_paced([failing(_api_error(502), _api_error(503))])
+    assert results == ["ok"] and len(sent) == 3 and 0.5 in sleeps and 1.0 in sleeps
+    
+    # Gateway errors without a JSON body, and timeouts, are transient too
+    results, sleeps, sent = _run_paced([failing(UnknownHTTPResponseError(504), RequestTimeoutError())])
+    assert results == ["ok"] and len(sent) == 3
+    
+    # Client errors are not retried
+    results, sleeps, sent = _run_paced([failing(_api_error(400))])
+    assert results == [400] and len(sent) == 1
+    
+    # Persistent failures give up after _WRITE_RETRIES attempts
+    results, sleeps, sent = _run_paced([failing(*[_api_error(503)] * 10)])
+    assert results == [503] and len(sent) == _WRITE_RETRIES
+    results, sleeps, sent = _run_paced([failing(*[RequestTimeoutError()] * 10)])
+    assert results == ["timeout"] and len(sent) == _WRITE_RETRIES
+
+def test_notion_write_failures_are_reported():
+    """Test that a write failing with a non-API error is reported, not raised."""
+    notion = NotionManager.__new__(NotionManager)
+    notion._next_write_at = 0.0
+    notion.client = Mock()
+    
+    async def update(**kwargs):
+        raise UnknownHTTPResponseError(400)
+    
+    async def no_sleep(delay):
+        pass
+    
+    notion.client.pages.update = update
+    with patch("src.notion_manager.asyncio.sleep", no_sleep):
+        result = asyncio.run(notion.update_rating("page-1", 4.5))
+    assert result["success"] is False
+
+def test_notion_writes_are_spaced():
+    """Test that back-to-back writes are sent at least the write interval apart."""
+    async def ok():
+        return "ok"
+    
+    results, sleeps, sent = _run_paced([ok, ok, ok])
+    assert results == ["ok"] * 3
+    gaps = [later - earlier for earlier, later in zip(sent, sent[1:])]
+    assert gaps == pytest.approx([_WRITE_INTERVAL_SECONDS] * 2)
+
+def test_sync_batch_results_line_up():
+    """Test that batched write results are mapped back to the right restaurants."""
+    location = Location(city="New York")
+    names = ["lookup fails", "not found", "write fails", "write raises", "saved", "refreshed"]
+    restaurants = [Restaurant(name=name, location=location, notion_page_id=name) for name in names]
+    restaurants[-1] = restaurants[-1].model_copy(update={
+        "google_places_data": GooglePlacesData(place_id="old", name="refreshed")
+    })
+    
+    class FakeMaps:
+        enrich_concurrency = 2
+        enrich_restaurants = GoogleMapsClient.enrich_restaurants
+        
+        async def enrich_restaurant_data(self, restaurant):
+            if restaurant.name == "lookup fails":
+                raise ValueError("maps down")
+            if restaurant.name != "not found":
+                restaurant.google_places_data = GooglePlacesData(place_id="p", name=restaurant.name)
+            return restaurant
+    
+    class FakeNotion:
+        update_restaurants_batch = NotionManager.update_restaurants_batch
+        
+        async def get_all_restaurants(self):
+            return list(restaurants)
+        
+        async def update_restaurant(self, page_id, restaurant):
+            if page_id == "write raises":
+                raise RuntimeError("timeout")
+            return {"success": page_id != "write fails", "error": "rejected"}
+    
+    sync = SyncManager(FakeNotion(), FakeMaps(), None)
+    
+    results = asyncio.run(sync._enrich_and_update(restaurants))
+    assert isinstance(results[0], ValueError)
+    assert results[1] is None
+    assert results[2] == {"success": False, "error": "rejected"}
+    assert results[3] == {"success": False, "error": "timeout"}
+    assert results[4]["success"] and results[5]["success"]
+    assert sync._count_updates(restaurants, results, "sync") == 2
+    
+    totals = asyncio.run(sync.manual_sync())["results"]
+    assert totals["total_restaurants"] == 6
+    assert totals["enriched_count"] == 1  # "saved" had no Google data before
+    assert totals["updated_count"] == 1  # "refreshed" did
+    assert totals["failed_count"] == 3
+    assert len(totals["errors"]) == 3
+
+def test_full_sync_selects_stale_pages():
+    """Test that the daily sync re-enriches only pages not edited in the last week."""
+    location = Location(city="New York")
+    now = datetime.now()
+    restaurants = [
+        Restaurant(name="fresh", location=location, notion_page_id="fresh", updated_at=now - timedelta(days=1)),
+        Restaurant(name="stale", location=location, notion_page_id="stale", updated_at=now - timedelta(days=30)),
+    ]
+    looked_up = []
+    
+    class FakeMaps:
+        enrich_concurrency = 2
+        enrich_restaurants = GoogleMapsClient.enrich_restaurants
+        
+        async def enrich_restaurant_data(self, restaurant):
+            looked_up.append(restaurant.name)
+            return restaurant
+    
+    class FakeNotion:
+        update_restaurants_batch = NotionManager.update_restaurants_batch
+        
+        def invalidate_cache(self):
+            pass
+        
+        async def get_all_restaurants(self):
+            return list(restaurants)
+    
+    asyncio.run(SyncManager(FakeNotion(), FakeMaps(), None)._full_database_sync())
+    assert looked_up == ["stale"]
+
+def test_cached_lookups_return_copies():
+    """Test that editing a looked-up restaurant leaves the cached one untouched."""
+    cached = Restaurant(
+        name="Cached", location=Location(city="New York"), notion_page_id="page-1",
+        google_places_data=GooglePlacesData(place_id="p", name="Cached", types=["restaurant"])
+    )
+    
+    notion = NotionManager.__new__(NotionManager)
+    notion._by_name_cache = TTLCache()
+    notion._by_name_cache.set("Cached", cached)
+    
+    found = asyncio.run(notion.get_restaurant_by_name("Cached"))
+    found.location.latitude = 1.0
+    found.google_places_data.types.append("cafe")
+    
+    assert cached.location.latitude is None
+    assert cached.google_places_data.types == ["restaurant"]
+    
+    maps = GoogleMapsClient.__new__(GoogleMapsClient)
+    maps._place_match_cache = TTLCache()
+    maps._place_match_cache.set(("cached", 40.7, -74.0, 10000), {"name": "Cached", "types": ["restaurant"]})
+    
+    match = asyncio.run(maps.find_restaurant_by_name("Cached", (40.7, -74.0)))
+    match["types"].append("cafe")
+    assert asyncio.run(maps.find_restaurant_by_name("Cached", (40.7, -74.0)))["types"] == ["restaurant"]
+
+def _refetching_notion(*snapshots):
+    """A NotionManager whose successive full fetches return the given name lists."""
+    location = Location(city="New York")
+    remaining = [[Restaurant(id=name, name=name, location=location, personal_rating=4.0) for name in names]
+                 for names in snapshots]
+    notion = NotionManager.__new__(NotionManager)
+    notion._all_restaurants_cache = TTLCache(maxsize=1, ttl=60)
+    notion.revision = 0
+    
+    async def iter_restaurants():
+        await asyncio.sleep(0.01)
+        for restaurant in remaining.pop(0):
+            yield restaurant
+    
+    notion.iter_restaurants = iter_restaurants
+    return notion
+
+def test_column_snapshot_follows_refetch():
+    """Test that a refetch rebuilds the column snapshot once, from the new data."""
+    notion = _refetching_notion(["A"], ["A", "B"])
+    manager = RestaurantManager(notion, Mock())
+    
+    first = asyncio.run(manager._get_notion_columns())
+    assert [r.name for r in first.restaurants] == ["A"]
+    
+    notion._all_restaurants_cache.clear()  # the TTL ran out
+    refetched = asyncio.run(manager._get_notion_columns())
+    assert [r.name for r in refetched.restaurants] == ["A", "B"]
+    assert asyncio.run(manager._get_notion_columns()) is refetched
+
+def test_visit_index_follows_refetch():
+    """Test that a refetch rebuilds the visit index once, from the new data."""
+    notion = _refetching_notion(["A"], ["A", "B"])
+    manager = RestaurantManager(notion, Mock())
+    
+    asyncio.run(manager.get_visit_index())
+    notion._all_restaurants_cache.clear()  # the TTL ran out
+    refetched = asyncio.run(manager.get_visit_index())
+    assert sorted(r.name for r in refetched.rated_between()) == ["A", "B"]
+    assert asyncio.run(manager.get_visit_index()) is refetched
+
+def test_write_during_fetch_is_not_current():
+    """Test that a fetch overtaken by a write isn't cached or tagged as current."""
+    notion = _refetching_notion(["A"], ["A", "B"])
+    notion._by_name_cache = TTLCache()
+    notion._query_cache = TTLCache()
+    
+    async def run():
+        pending = asyncio.ensure_future(notion.get_all_restaurants_with_revision())
+        await asyncio.sleep(0.001)
+        notion.invalidate_cache()  # a write
+        return await pending, await notion.get_all_restaurants_with_revision()
+    
+    (stale_revision, stale), (revision, fresh) = asyncio.run(run())
+    assert [r.name for r in stale] == ["A"] and [r.name for r in fresh] == ["A", "B"]
+    assert stale_revision < revision == notion.revision
+
+def test_profile_follows_refetch():
+    """Test that a write rebuilds the cached profile once, from the refetched data."""
+    notion = _refetching_notion(["A"], ["A", "B"])
+    notion._by_name_cache = TTLCache()
+    notion._query_cache = TTLCache()
+    manager = RestaurantManager(notion, Mock())
+    
+    assert asyncio.run(manager._get_or_create_user_profile("u")).total_restaurants == 1
+    notion.invalidate_cache()  # a write
+    profile = asyncio.run(manager._get_or_create_user_profile("u"))
+    assert profile.total_restaurants == 2
+    assert asyncio.run(manager._get_or_create_user_profile("u")) is profile
+
+def test_cached_properties_follow_field_changes():
+    """Test that derived values are recomputed after fields change."""
+    restaurant = Restaurant(name="Old Name", location=Location(city="New York"),
+                            cuisine_types=[CuisineType.ITALIAN])
+    assert restaurant.summary["name"] == "Old Name"
+    assert restaurant.folded_name == "old name"
+    
+    restaurant.name = "New Name"
+    restaurant.cuisine_types = [CuisineType.FRENCH]
+    restaurant.location = Location(city="Boston", state="MA")
+    assert restaurant.summary["name"] == "New Name"
+    assert restaurant.summary["cuisine_types"] == ("French",)
+    assert restaurant.summary["location"] == "Boston, MA"
+    assert restaurant.folded_name == "new name"
+    
+    copy = restaurant.model_copy(update={"personal_rating": 4.5})
+    assert copy.summary["rating"] == 4.5
+    assert restaurant.summary["rating"] is None
+
+def test_notion_page_parse_roundtrip():
+    """Test that the unvalidated Notion parse matches a fully validated model."""
+    page = {
+        "id": "page-1",
+        "properties": {
+            "Name": {"title": [{"plain_text": "Test Restaurant"}]},
+            "City": {"rich_text": [{"plain_text": "New York"}]},
+            "State": {"multi_select": [{"name": "NY"}]},
+            "Score": {"select": {"name": "⭐⭐⭐⭐"}},
+            "Cuisine": {"multi_select": [{"name": "Italian"}, {"name": "Unknown"}]},
+            "Price Range": {"select": {"name": "$$"}},
+            "Vibes": {"multi_select": [{"name": "cozy"}]},
+            "Date": {"date": {"start": "2024-03-01"}},
+            "Revisit": {"checkbox": True},
+            "Google Place ID": {"rich_text": [{"plain_text": "place-1"}]},
+        },
+        "last_edited_time": "2024-03-02T12:30:00.000Z",
+    }
+    
+    # Parsing does not touch instance state, so skip the API client setup
+    restaurant = NotionManager.__new__(NotionManager)._parse_notion_page_to_restaurant(page)
+    validated = Restaurant.model_validate(restaurant.model_dump())
+    
+    assert restaurant == validated
+    assert restaurant.cuisine_types == [CuisineType.ITALIAN]
+    assert restaurant.price_range == PriceRange.MODERATE
+    assert isinstance(restaurant.personal_rating, float)
+    assert restaurant.location.country == "USA"
+    assert restaurant.google_places_data.place_id == "place-1"
+    assert restaurant.updated_at == datetime(2024, 3, 2, 12, 30, tzinfo=timezone.utc).astimezone().replace(tzinfo=None)
+
 if __name__ == "__main__":
     print("🧪 Running basic tests...")
     